@@ -18,21 +18,28 @@ import os
 import sys
 import time
 import logging
-import tarfile
-import tempfile
-import base64
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+import urllib3
 import gzip
 import shutil
 import subprocess
 import socket
 import json
+import fnmatch
+import random
 import shlex
+import hashlib
+import heapq
+import signal
+import threading
+import contextlib
 from enum import Enum
 from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
-from datetime import datetime, timezone
 
 # Environment detection - determines K8s vs VM mode
 ENVIRONMENT = "kubernetes" if os.getenv("KUBERNETES_SERVICE_HOST") else "vm"
@@ -48,17 +55,45 @@ GPU_TYPE = os.environ.get("GPU_TYPE", "nvidia").lower()  # nvidia or amd
 LOG_OUTPUT_DIR = os.environ.get("LOG_OUTPUT_DIR", "/logs")
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
 MAX_LOGS_TO_KEEP = int(os.environ.get("MAX_LOGS_TO_KEEP", "1"))
+MAX_LOGS_BYTES = int(os.environ.get("MAX_LOGS_BYTES", str(5 * 1024**3)))
+DEDUPLICATE_REPORTS = os.environ.get("DEDUPLICATE_REPORTS", "false").lower() == "true"
 
 # API configuration
 API_BASE_URL = os.environ.get("API_BASE_URL", os.environ.get("LOG_COLLECTOR_API_BASE_URL", "https://cms-monitoring.crusoecloud.com"))
 API_POLL_INTERVAL = int(os.environ.get("API_POLL_INTERVAL", "60"))
+API_MAX_BACKOFF = int(os.environ.get("API_MAX_BACKOFF", "900"))
+# Seconds the API may hold a task poll open waiting for a task (long-poll); 0 disables.
+# Requires server support: the API answers 200 as soon as a task is queued, 204 when the wait ends.
+API_LONG_POLL_WAIT = int(os.environ.get("API_LONG_POLL_WAIT", "0"))
 API_ENABLED = os.environ.get("API_ENABLED", "false").lower() == "true"
 COLLECTION_TIMEOUT = int(os.environ.get("COLLECTION_TIMEOUT", "300"))
+# Seconds of COLLECTION_TIMEOUT held back from rocm_techsupport.sh, so a report that
+# ran long can still be compressed before the collection deadline.
+AMD_COMPRESS_RESERVE = min(30, COLLECTION_TIMEOUT // 10)
 COLLECTION_INTERVAL = int(os.environ.get("COLLECTION_INTERVAL", "3600"))
 CRUSOE_AUTH_TOKEN = os.environ.get("CRUSOE_MONITORING_TOKEN") or os.environ.get("CRUSOE_AUTH_TOKEN")
 PROXY_ENABLED = os.environ.get("PROXY_ENABLED", "false").lower() == "true"
 PROXY_URL     = os.environ.get("PROXY_URL", "")
 PROXY_PORT    = os.environ.get("PROXY_PORT", "3128")
+# (connect, read) timeouts for monitoring API calls. The short connect timeout lets an
+# unreachable API fail fast so poll backoff starts sooner; uploads get a longer read timeout.
+API_TIMEOUT = (3.05, 10)
+API_UPLOAD_TIMEOUT = (3.05, 60)
+
+
+# Run inside the driver pod by run_and_fetch; {base} and {gz} are shell-quoted paths.
+# Exit codes are mapped back to BugReportError. The report normally arrives gzipped
+# and is sent as-is; an uncompressed one is gzipped in the pod so it is always
+# compressed on the wire and on disk.
+_RUN_AND_FETCH_SCRIPT = (
+    "trap 'rm -f {base} {gz}' EXIT; "
+    "trap 'exit 1' HUP INT TERM PIPE; "
+    "command -v nvidia-bug-report.sh >/dev/null || exit 127; "
+    "nvidia-bug-report.sh --output-file {base} 1>&2 || exit 3; "
+    "if [ -s {gz} ]; then cat {gz}; "
+    "elif [ -s {base} ]; then gzip -c {base}; "
+    "else exit 4; fi"
+)
 
 
 def _get_proxies() -> Optional[Dict[str, str]]:
@@ -67,11 +102,88 @@ def _get_proxies() -> Optional[Dict[str, str]]:
         return {"http": proxy, "https": proxy}
     return None
 
+def _tcp_keepalive_socket_options() -> list:
+    """urllib3's default socket options (TCP_NODELAY) plus TCP keepalive probing."""
+    options = list(urllib3.connection.HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Probe after 30s idle, every 10s, and drop the connection after 3 missed probes
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+class _KeepaliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections use _tcp_keepalive_socket_options() (TCP_NODELAY plus keepalive)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = _tcp_keepalive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["socket_options"] = _tcp_keepalive_socket_options()
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+def _build_http_session() -> requests.Session:
+    """Session for the monitoring API; keeps the TLS connection alive between polls."""
+    session = requests.Session()
+    # Only connect failures are retried: the request never reached the server, so even an
+    # upload is safe to resend. A read timeout on a long poll is left to the poll loop
+    # and its backoff rather than stacking two more full waits behind it
+    adapter = _KeepaliveHTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.5))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _gzip_report(path: Path, deadline: float) -> Path:
+    """
+    Compress path to "<path>.gz" and remove the original.
+
+    Uses pigz across all CPUs when it is installed, otherwise Python's gzip module.
+
+    Raises:
+        TimeoutError: Compression did not finish by deadline (a time.monotonic() value);
+            the partial .gz is removed and the original is left in place
+    """
+    gz_path = path.with_name(path.name + ".gz")
+    pigz = shutil.which("pigz")
+    if pigz:
+        try:
+            subprocess.run([pigz, "-f", "-p", str(os.cpu_count() or 1), str(path)],
+                           check=True, capture_output=True, timeout=max(deadline - time.monotonic(), 0))
+            return gz_path
+        except subprocess.TimeoutExpired as e:
+            gz_path.unlink(missing_ok=True)
+            raise TimeoutError("pigz did not finish before the collection deadline") from e
+        except (subprocess.SubprocessError, OSError) as e:
+            LOG.warning(f"pigz failed, compressing with gzip instead: {e}")
+
+    # 1 MiB reads keep the number of read/compress/write rounds low for large reports.
+    try:
+        with open(path, "rb", buffering=0) as f_in, gzip.open(gz_path, "wb") as f_out:
+            while chunk := f_in.read(1 << 20):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("gzip did not finish before the collection deadline")
+                f_out.write(chunk)
+    except TimeoutError:
+        gz_path.unlink(missing_ok=True)
+        raise
+    path.unlink(missing_ok=True)
+    return gz_path
+
+def _report_timestamp() -> str:
+    """UTC timestamp for bug report filenames, so names sort and compare the same across regions."""
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+
 # K8s-specific configuration (only used when ENVIRONMENT == "kubernetes")
 NODE_NAME = os.environ.get("NODE_NAME")
 DRIVER_NAMESPACE = os.environ.get("DRIVER_NAMESPACE", "nvidia-gpu-operator" if GPU_TYPE == "nvidia" else "amd-gpu-operator")
 DRIVER_POD_PREFIX = os.environ.get("DRIVER_POD_PREFIX", f"{GPU_TYPE}-gpu-driver")
+NVIDIA_DRIVER_LABEL = os.environ.get("NVIDIA_DRIVER_LABEL", "app.kubernetes.io/component=nvidia-driver")
 RUN_ONCE = os.environ.get("RUN_ONCE", "false").lower() == "true"
+DRIVER_POD_CACHE_TTL = int(os.environ.get("DRIVER_POD_CACHE_TTL", "3600"))
+# Optional pod name template, e.g. "nvidia-gpu-driver-daemonset-{node}", for deployments that give
+# the driver pod a predictable name. When set, the pod is fetched by name before listing pods.
+NVIDIA_DRIVER_POD_NAME_TEMPLATE = os.environ.get("NVIDIA_DRIVER_POD_NAME_TEMPLATE", "")
 
 # Logging context — fields injected automatically into every log record within a task
 _log_ctx: ContextVar[dict] = ContextVar('log_ctx', default={})
@@ -89,10 +201,18 @@ def clear_log_context() -> None:
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging - efficient and no parsing needed."""
 
+    _LEVEL_NAMES = {level: logging.getLevelName(level).lower()
+                    for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)}
+
+    def formatTime(self, record, datefmt=None):
+        """UTC ISO-8601 timestamp with microseconds, e.g. 2026-01-06T14:30:22.123456Z."""
+        created = record.created
+        return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(created))}.{int(created % 1 * 1e6):06d}Z"
+
     def format(self, record):
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "level": record.levelname.lower(),
+            "timestamp": self.formatTime(record),
+            "level": self._LEVEL_NAMES.get(record.levelno) or record.levelname.lower(),
             "message": record.getMessage(),
         }
 
@@ -107,11 +227,42 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["stacktrace"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data)
+        # Compact separators: no padding bytes on every line shipped through kubectl logs / Vector
+        return json.dumps(log_data, separators=(",", ":"))
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that leaves routine records in the stream's buffer instead of flushing each one.
+
+    WARNING and above are flushed immediately; otherwise the buffer is flushed once FLUSH_INTERVAL
+    has passed since the last flush, by the run loops before they go idle, and before each
+    long blocking step (the exec, a local script, the upload).
+    """
+
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
 
-# Logging setup
-handler = logging.StreamHandler(sys.stdout)
+
+# Logging setup; logging.shutdown() flushes the handler at interpreter exit
+handler = BufferedStreamHandler(sys.stdout)
 handler.setFormatter(JSONFormatter())
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
@@ -132,6 +283,7 @@ class BugReportError(Enum):
     DOWNLOAD_FAILED      = ("CWA-BR-5007", "Unexpected error downloading bug report")
     COLLECTION_TIMED_OUT = ("CWA-BR-5008", "Bug report generation timed out")
     UPLOAD_FAILED        = ("CWA-BR-5009", "Bug report upload failed")
+    SHUTTING_DOWN        = ("CWA-BR-5010", "Bug report collection interrupted by shutdown")
     INTERNAL_ERROR       = ("CWA-BR-5099", "Internal Server Error")
 
     def __init__(self, code: str, message: str):
@@ -139,6 +291,94 @@ class BugReportError(Enum):
         self.message = message
 
 
+def _exec_returncode(resp) -> Optional[int]:
+    """Exit code of a finished exec, or None if the stream ended without reporting one."""
+    try:
+        return resp.returncode
+    except Exception:
+        # No status on the error channel, e.g. the websocket dropped mid-stream
+        return None
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write data to a raw fd, bypassing BufferedWriter's copy; os.write may write only part."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _drop_page_cache(fd: int) -> None:
+    """
+    Flush a freshly written report and evict it from the page cache.
+
+    Reports land on a hostPath and are rarely read back, so keeping them cached
+    only pushes out pages the kubelet and container runtime are using.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        LOG.debug("Could not drop report from page cache: %s", e)
+
+
+class _ExecStreamReader:
+    """
+    Reads an exec stream opened with _preload_content=False under one overall deadline.
+
+    stdout is handed out chunk by chunk via read_chunk(); stderr is accumulated
+    on the side.
+    """
+
+    def __init__(self, resp, timeout: int = COLLECTION_TIMEOUT, interruptible=contextlib.nullcontext):
+        self._resp = resp
+        self._timeout = timeout
+        # Context manager wrapped around each blocking update(), e.g. to let SIGTERM break out of it
+        self._interruptible = interruptible
+        self._deadline = time.monotonic() + timeout
+        self.stdout_received = 0
+        self.stderr = ""
+
+    def read_chunk(self):
+        """Return the next non-empty stdout chunk, or None once the stream has closed."""
+        # update() polls the websocket's socket and returns as soon as a frame
+        # arrives, so block for the whole remaining budget instead of waking
+        # every second. This relies on update() checking SSLSocket.pending()
+        # first (kubernetes>=31.0.0): without it, frames already decrypted into
+        # the TLS buffer would wait out the deadline. The deadline is what bounds the collection: a hung exec
+        # (stream never closes) would otherwise block the collector, and with it
+        # every later poll or scheduled run, indefinitely.
+        while self._resp.is_open():
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Timed out reading exec stream after {self._timeout:.0f}s "
+                    f"(received {self.stdout_received} stdout / {len(self.stderr)} stderr chars)"
+                )
+            with self._interruptible():
+                self._resp.update(timeout=remaining)
+            if self._resp.peek_stderr():
+                chunk = self._resp.read_stderr()
+                if isinstance(chunk, bytes):
+                    chunk = chunk.decode("utf-8", "replace")
+                if chunk:
+                    self.stderr += chunk
+            if self._resp.peek_stdout():
+                chunk = self._resp.read_stdout()
+                if chunk:
+                    self.stdout_received += len(chunk)
+                    return chunk
+        return None
+
+    def close(self):
+        self._resp.close()
+
+
+class _ShutdownRequested(Exception):
+    """Raised when SIGTERM arrives while a bug report script or exec stream is running."""
+
+
 class LogCollector:
     """
     Unified GPU log collector supporting both Kubernetes and VM environments.
@@ -152,6 +392,22 @@ class LogCollector:
         self.output_dir = Path(LOG_OUTPUT_DIR)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Set by SIGTERM; checked between collection stages and by the scheduler's wait
+        self._shutdown = threading.Event()
+        # Set only around the blocking exec stream read; SIGTERM then also raises
+        # _ShutdownRequested in the main thread instead of waiting for the deadline
+        self._interrupt_on_sigterm = False
+
+        # Bundled driver vs. GPU Operator mode, decided on the first collection
+        self._bundled_mode: Optional[bool] = None
+
+        # Shared by check_for_tasks and report_result so polls reuse one connection
+        self.http = _build_http_session()
+        self.http.headers.update(self._get_auth_headers())
+        # Consecutive failed polls; stretches the poll interval while the API is unavailable
+        self._poll_failures = 0
+        self._last_poll_started = 0.0
+
         # Environment-specific initialization
         if self.environment == "kubernetes":
             self._init_kubernetes()
@@ -171,6 +427,15 @@ class LogCollector:
         self.driver_namespace = DRIVER_NAMESPACE
         self.driver_pod_prefix = DRIVER_POD_PREFIX
 
+        # Driver pod found by the last full lookup, re-verified by name on later cycles
+        self._cached_driver_pod = None
+        self._cached_driver_pod_ts = 0.0
+        # Driver container name per pod UID; a pod's container list never changes
+        self._container_name_cache: Dict[str, str] = {}
+        # Node instance-type label, read once; it is fixed for the lifetime of the node
+        self._node_instance_type: Optional[str] = None
+        self._node_instance_type_loaded = False
+
         # Get VM_ID from environment or read from DMI
         self.vm_id = os.environ.get("VM_ID")
         if not self.vm_id:
@@ -184,7 +449,12 @@ class LogCollector:
             config.load_kube_config()
             LOG.info("Loaded kubeconfig from local environment")
 
-        self.k8s_api = client.CoreV1Api()
+        # A larger pool and TCP keepalive let API calls reuse established, TLS-negotiated
+        # connections to the apiserver across collection cycles instead of reconnecting.
+        k8s_config = client.Configuration.get_default_copy()
+        k8s_config.connection_pool_maxsize = 16
+        k8s_config.socket_options = _tcp_keepalive_socket_options()
+        self.k8s_api = client.CoreV1Api(client.ApiClient(k8s_config))
         LOG.info(f"Initialized {self.gpu_type.upper()} log collector for K8s node: {self.node_name}")
         if self.vm_id:
             LOG.info(f"VM ID: {self.vm_id}")
@@ -270,36 +540,65 @@ class LogCollector:
         try:
             url = f"{API_BASE_URL}/agent/check-tasks"
             params = {"vm_id": self.vm_id}
-            headers = self._get_auth_headers()
+            timeout = API_TIMEOUT
+            if API_LONG_POLL_WAIT > 0:
+                params["wait"] = API_LONG_POLL_WAIT
+                timeout = (API_TIMEOUT[0], API_TIMEOUT[1] + API_LONG_POLL_WAIT)
 
-            LOG.debug(f"Polling API: {url} with params: {params}")
-            response = requests.get(url, params=params, headers=headers, timeout=10, proxies=_get_proxies())
+            LOG.debug("Polling API: %s with params: %s", url, params)
+            self._last_poll_started = time.monotonic()
+            response = self.http.get(url, params=params, timeout=timeout, proxies=_get_proxies())
 
             if response.status_code == 200:
+                self._poll_failures = 0
                 data = response.json()
                 if data.get("status") == "success" and data.get("event_id"):
                     LOG.info("Received task", extra={"event_id": data['event_id']})
                     return data
                 else:
-                    LOG.debug(f"No tasks available: {data}")
+                    LOG.debug("No tasks available: %s", data)
                     return None
-            elif response.status_code == 404:
+            elif response.status_code in (204, 404):
+                self._poll_failures = 0
                 LOG.debug("No tasks found for this VM")
                 return None
             else:
+                self._poll_failures += 1
                 LOG.warning(f"Unexpected API response: {response.status_code} - {response.text}")
                 return None
 
         except requests.exceptions.Timeout:
+            self._poll_failures += 1
             LOG.warning("API request timed out")
             return None
         except requests.exceptions.RequestException as e:
+            self._poll_failures += 1
             LOG.error(f"API request failed: {e}")
             return None
         except Exception as e:
+            self._poll_failures += 1
             LOG.error(f"Unexpected error checking for tasks: {e}")
             return None
 
+    def _next_poll_delay(self) -> float:
+        """
+        Seconds to wait before the next poll.
+
+        API_POLL_INTERVAL normally. After failed polls the upper bound doubles per consecutive
+        failure up to API_MAX_BACKOFF, and the delay is drawn uniformly between API_POLL_INTERVAL
+        and that bound, so nodes that failed together spread their retries over the whole window.
+
+        With API_LONG_POLL_WAIT, the interval is counted from the start of the previous poll, so
+        a poll the server held open for the whole interval is re-issued straight away, while a
+        server that answers immediately is still polled no more often than API_POLL_INTERVAL.
+        """
+        if self._poll_failures == 0:
+            if API_LONG_POLL_WAIT > 0:
+                return max(0.0, API_POLL_INTERVAL - (time.monotonic() - self._last_poll_started))
+            return API_POLL_INTERVAL
+        backoff = min(API_POLL_INTERVAL * 2 ** min(self._poll_failures, 8), API_MAX_BACKOFF)
+        return random.uniform(API_POLL_INTERVAL, max(backoff, API_POLL_INTERVAL))
+
     def report_result(self, event_id: str, status: str, log_file: Optional[Path] = None, error_code: str = "", message: str = "") -> bool:
         """
         Report collection result to the API - combines upload and status in a single call.
@@ -315,23 +614,26 @@ class LogCollector:
         """
         try:
             url = f"{API_BASE_URL}/agent/upload-logs"
-            headers = self._get_auth_headers()
 
             if log_file and status == "success":
                 # Success case - upload file with success status
                 LOG.info(f"Uploading log file {log_file.name} with success status")
+                handler.flush()
 
                 with open(log_file, 'rb') as f:
-                    files = {'file': (log_file.name, f, 'application/gzip')}
-                    data = {
+                    # MultipartEncoder streams the file from disk as the body is sent,
+                    # instead of requests reading the whole report into memory first
+                    body = MultipartEncoder(fields={
                         'vm_id': self.vm_id,
                         'event_id': event_id,
                         'node_name': self.node_name,
                         'status': status,
-                        'message': message if message else 'Logs collected and uploaded successfully'
-                    }
+                        'message': message if message else 'Logs collected and uploaded successfully',
+                        'file': (log_file.name, f, 'application/gzip' if log_file.suffix == '.gz' else 'text/plain'),
+                    })
 
-                    response = requests.post(url, files=files, data=data, headers=headers, timeout=60, proxies=_get_proxies())
+                    response = self.http.post(url, data=body, headers={'Content-Type': body.content_type},
+                                              timeout=API_UPLOAD_TIMEOUT, proxies=_get_proxies())
             else:
                 # Failed case - send status only
                 LOG.info(f"Sending {status} status", extra={
@@ -347,7 +649,7 @@ class LogCollector:
                     'node_name': self.node_name
                 }
 
-                response = requests.post(url, json=data, headers=headers, timeout=10, proxies=_get_proxies())
+                response = self.http.post(url, json=data, timeout=API_TIMEOUT, proxies=_get_proxies())
 
             if response.status_code == 200:
                 LOG.info(f"Successfully reported {status} result")
@@ -370,15 +672,22 @@ class LogCollector:
         """
         Get the instance type from Kubernetes node labels (K8s only).
 
+        The label is read from the apiserver once and reused afterwards; a failed
+        read is retried on the next call.
+
         Returns:
             Instance type (e.g., "a100-80gb.1x", "gb200-320gb.1x") or None
         """
         if self.environment != "kubernetes":
             return None
+        if self._node_instance_type_loaded:
+            return self._node_instance_type
 
         try:
-            node = self.k8s_api.read_node(self.node_name)
-            return node.metadata.labels.get('node.kubernetes.io/instance-type')
+            node = self.k8s_api.read_node(self.node_name, _request_timeout=10)
+            self._node_instance_type = (node.metadata.labels or {}).get('node.kubernetes.io/instance-type')
+            self._node_instance_type_loaded = True
+            return self._node_instance_type
         except ApiException as e:
             LOG.error(f"Error reading node labels: {e}", exc_info = True)
             return None
@@ -387,10 +696,23 @@ class LogCollector:
         """
         Determine if this node uses bundled driver mode (K8s only).
 
+        The decision is made once and reused, since it depends only on the GPU type and
+        the node's instance type. It is re-evaluated while the instance type could not be read.
+
         Returns:
             True if node should use bundled drivers (execute locally),
             False for GPU Operator path (exec into driver pod)
         """
+        if self._bundled_mode is not None:
+            return self._bundled_mode
+
+        bundled = self._detect_bundled_driver_mode()
+        if self.environment != "kubernetes" or self.gpu_type == "amd" or self._node_instance_type_loaded:
+            self._bundled_mode = bundled
+        return bundled
+
+    def _detect_bundled_driver_mode(self) -> bool:
+        """Decide between bundled driver mode and the GPU Operator path for this node."""
         if self.environment == "vm":
             # VMs always use bundled/local mode
             return True
@@ -414,10 +736,18 @@ class LogCollector:
         """
         Find the NVIDIA GPU driver pod running on this node (K8s only).
 
-        Primary: Uses label selector (app.kubernetes.io/component=nvidia-driver) which is
-        set by the official NVIDIA GPU Operator.
+        Primary: Uses label selector (NVIDIA_DRIVER_LABEL, default
+        app.kubernetes.io/component=nvidia-driver) which is set by the official NVIDIA GPU Operator.
         Fallback: Uses pod name prefix for custom/legacy deployments.
 
+        Both lookups ask the apiserver for Running pods on this node only.
+
+        If NVIDIA_DRIVER_POD_NAME_TEMPLATE is set, the pod name it implies is read directly
+        first and the list lookups are only used when that pod does not exist.
+
+        A pod found this way is cached for DRIVER_POD_CACHE_TTL seconds; later calls
+        re-read it by name instead of listing pods again.
+
         Returns:
             V1Pod object if found, None otherwise
         """
@@ -425,38 +755,49 @@ class LogCollector:
             return None
 
         try:
+            cached_pod = self._revalidate_cached_driver_pod()
+            if cached_pod is not None:
+                return cached_pod
+
+            named_pod = self._read_driver_pod_by_template()
+            if named_pod is not None:
+                self._cache_driver_pod(named_pod)
+                return named_pod
+
+            # Filter server-side so only Running pods on this node come back.
+            # resource_version="0" lets the apiserver answer from its watch cache
+            # instead of doing a quorum read from etcd.
+            field_selector = f"spec.nodeName={self.node_name},status.phase=Running"
+
             # Primary: Find by label selector (reliable, set by GPU Operator)
             pods = self.k8s_api.list_namespaced_pod(
                 namespace=self.driver_namespace,
-                field_selector=f"spec.nodeName={self.node_name}",
-                label_selector="app.kubernetes.io/component=nvidia-driver"
+                field_selector=field_selector,
+                label_selector=NVIDIA_DRIVER_LABEL,
+                resource_version="0",
+                _request_timeout=10
             )
 
-            for pod in pods.items:
-                if pod.status.phase == "Running":
-                    LOG.info(f"Found NVIDIA driver pod by label selector: {pod.metadata.name}")
-                    return pod
-                else:
-                    LOG.warning(
-                        f"Found NVIDIA driver pod {pod.metadata.name} by label but it's not Running (status: {pod.status.phase})"
-                    )
+            if pods.items:
+                pod = pods.items[0]
+                LOG.info(f"Found NVIDIA driver pod by label selector: {pod.metadata.name}")
+                self._cache_driver_pod(pod)
+                return pod
 
             # Fallback: Find by pod name prefix (for custom/legacy deployments)
             LOG.info(f"No pod found with label selector, trying name prefix fallback: '{self.driver_pod_prefix}'")
             pods = self.k8s_api.list_namespaced_pod(
                 namespace=self.driver_namespace,
-                field_selector=f"spec.nodeName={self.node_name}"
+                field_selector=field_selector,
+                resource_version="0",
+                _request_timeout=10
             )
 
             for pod in pods.items:
                 if pod.metadata.name.startswith(self.driver_pod_prefix):
-                    if pod.status.phase == "Running":
-                        LOG.info(f"Found NVIDIA driver pod by name prefix: {pod.metadata.name}")
-                        return pod
-                    else:
-                        LOG.warning(
-                            f"Found NVIDIA driver pod {pod.metadata.name} but it's not Running (status: {pod.status.phase})"
-                        )
+                    LOG.info(f"Found NVIDIA driver pod by name prefix: {pod.metadata.name}")
+                    self._cache_driver_pod(pod)
+                    return pod
 
             LOG.warning(
                 f"No running NVIDIA driver pod found",
@@ -466,6 +807,8 @@ class LogCollector:
             return None
 
         except ApiException as e:
+            if e.status in (404, 410):
+                self._cached_driver_pod = None
             LOG.error(
                 f"Kubernetes API error finding NVIDIA driver pod: {e}",
                 exc_info=True,
@@ -474,20 +817,97 @@ class LogCollector:
             )
             return None
 
-    def execute_nvidia_bug_report(self, pod, event_id: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    def _cache_driver_pod(self, pod):
+        self._cached_driver_pod = pod
+        self._cached_driver_pod_ts = time.monotonic()
+
+    def _read_driver_pod_by_template(self):
         """
-        Execute nvidia-bug-report.sh in the driver pod (K8s only).
+        Read the driver pod named by NVIDIA_DRIVER_POD_NAME_TEMPLATE for this node.
+
+        Returns:
+            V1Pod if the named pod exists and is Running, None otherwise
+        """
+        if not NVIDIA_DRIVER_POD_NAME_TEMPLATE:
+            return None
+
+        pod_name = NVIDIA_DRIVER_POD_NAME_TEMPLATE.format(node=self.node_name)
+        try:
+            pod = self.k8s_api.read_namespaced_pod(
+                name=pod_name,
+                namespace=self.driver_namespace,
+                _request_timeout=10
+            )
+        except ApiException as e:
+            if e.status == 404:
+                LOG.info(f"NVIDIA driver pod {pod_name} not found by name, listing pods instead")
+                return None
+            raise
+
+        if pod.status.phase != "Running":
+            LOG.info(f"NVIDIA driver pod {pod_name} is not Running (status: {pod.status.phase}), listing pods instead")
+            return None
+
+        LOG.info(f"Found NVIDIA driver pod by name: {pod_name}")
+        return pod
+
+    def _revalidate_cached_driver_pod(self):
+        """
+        Re-read the cached driver pod by name (a single-object GET rather than a list).
+
+        Returns:
+            The fresh V1Pod if it is still Running, None if there is no usable cache entry
+        """
+        if self._cached_driver_pod is None:
+            return None
+        if time.monotonic() - self._cached_driver_pod_ts >= DRIVER_POD_CACHE_TTL:
+            self._cached_driver_pod = None
+            return None
+
+        pod_name = self._cached_driver_pod.metadata.name
+        try:
+            pod = self.k8s_api.read_namespaced_pod(
+                name=pod_name,
+                namespace=self.driver_namespace,
+                _request_timeout=10
+            )
+        except ApiException as e:
+            if e.status in (404, 410):
+                LOG.info(f"Cached NVIDIA driver pod {pod_name} no longer exists, looking it up again")
+                self._cached_driver_pod = None
+                return None
+            raise
+
+        if pod.status.phase != "Running":
+            LOG.info(f"Cached NVIDIA driver pod {pod_name} is not Running (status: {pod.status.phase}), looking it up again")
+            self._cached_driver_pod = None
+            return None
+
+        self._cached_driver_pod = pod
+        return pod
+
+    def run_and_fetch(self, pod, event_id: Optional[str] = None,
+                      deadline: Optional[float] = None) -> Tuple[Optional[Path], Optional[str], Optional[str]]:
+        """
+        Generate nvidia-bug-report in the driver pod and stream it back in one exec (K8s only).
+
+        The report is written to stdout (progress goes to stderr) and removed from the
+        pod by the same shell, so it is never left behind even if the download fails.
 
         Args:
             pod: The NVIDIA driver pod
             event_id: Optional event ID to include in filename
+            deadline: time.monotonic() value the collection must finish by
+                (defaults to COLLECTION_TIMEOUT from now)
 
         Returns:
-            Tuple of (path to log file within pod, error_code, error_message).
-            On success: (path, None, None). On failure: (None, "CWA-BR-NNNN", "user-facing message").
+            Tuple of (path to downloaded log file, error_code, error_message).
+            On success: (Path, None, None). On failure: (None, "CWA-BR-NNNN", "user-facing message").
         """
         if self.environment != "kubernetes":
             return None, None, None
+        if deadline is None:
+            deadline = time.monotonic() + COLLECTION_TIMEOUT
 
         pod_name = pod.metadata.name
         container_name = self._get_driver_container_name(pod)
@@ -502,57 +922,51 @@ class LogCollector:
 
         LOG.info(f"Executing nvidia-bug-report.sh in pod {pod_name}, container {container_name}")
 
-        try:
-            # Generate unique filename with timestamp and optional event_id
-            # Note: nvidia-bug-report.sh automatically adds .gz extension
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if event_id:
-                log_filename_base = f"nvidia-bug-report-{self.node_name}-{event_id}-{timestamp}.log"
-            else:
-                log_filename_base = f"nvidia-bug-report-{self.node_name}-{timestamp}.log"
-            log_path_base = f"/tmp/{log_filename_base}"
-
-            # The actual file will have .gz appended by nvidia-bug-report.sh
-            actual_log_path = f"{log_path_base}.gz"
-
-            # Execute nvidia-bug-report.sh (it will add .gz automatically)
-            exec_command = [
-                "/bin/bash",
-                "-c",
-                f"nvidia-bug-report.sh --output-file {shlex.quote(log_path_base)} && echo {shlex.quote(actual_log_path)}"
-            ]
-
-            LOG.info(f"Running command: {' '.join(exec_command)}")
-
-            resp = stream(
-                self.k8s_api.connect_get_namespaced_pod_exec,
-                pod_name,
-                self.driver_namespace,
-                container=container_name,
-                command=exec_command,
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=False,
-                _preload_content=False
-            )
+        # Generate unique filename with timestamp and optional event_id
+        # Note: nvidia-bug-report.sh automatically adds .gz extension
+        timestamp = _report_timestamp()
+        if event_id:
+            log_filename_base = f"nvidia-bug-report-{self.node_name}-{event_id}-{timestamp}.log"
+        else:
+            log_filename_base = f"nvidia-bug-report-{self.node_name}-{timestamp}.log"
+        remote_path_base = shlex.quote(f"/tmp/{log_filename_base}")
+        remote_path = shlex.quote(f"/tmp/{log_filename_base}.gz")
 
-            stdout_output, stderr_output = self._read_exec_stream(resp)
+        output_file = self.output_dir / f"{log_filename_base}.gz"
+        # Write under a temporary name so a partial download is never mistaken for a report
+        part_file = output_file.with_name(output_file.name + ".part")
 
-            if actual_log_path in stdout_output or "Bug report generated" in stdout_output:
-                LOG.info(
-                    f"nvidia-bug-report.sh completed successfully, log file: {actual_log_path}",
-                )
-                return actual_log_path, None, None
-            else:
+        exec_command = ["/bin/bash", "-c", _RUN_AND_FETCH_SCRIPT.format(base=remote_path_base, gz=remote_path)]
+
+        LOG.info("Running command: %s", " ".join(exec_command))
+        handler.flush()
+
+        try:
+            returncode, stderr_output = self._stream_exec_to_file(pod_name, container_name, exec_command, part_file, deadline)
+
+            received = part_file.stat().st_size
+            LOG.debug("Received %d bytes from pod %s, exit code %s", received, pod_name, returncode)
+
+            if returncode != 0:
+                part_file.unlink(missing_ok=True)
+                error = {
+                    127: BugReportError.SCRIPT_UNAVAILABLE,
+                    3: BugReportError.SCRIPT_FAILED,
+                    4: BugReportError.NO_OUTPUT,
+                }.get(returncode, BugReportError.DOWNLOAD_FAILED)
                 LOG.error(
-                    f"nvidia-bug-report.sh returned no expected output",
-                    extra={"error_code": BugReportError.NO_OUTPUT.code,
-                           "root_cause": f"stdout: {stdout_output!r}, stderr: {stderr_output!r}"},
+                    f"Bug report collection from pod {pod_name} failed",
+                    extra={"error_code": error.code,
+                           "root_cause": f"exit code {returncode}, received {received} bytes; stderr={stderr_output[-500:]!r}"},
                 )
-                return None, BugReportError.NO_OUTPUT.code, BugReportError.NO_OUTPUT.message
+                return None, error.code, error.message
+
+            os.replace(part_file, output_file)
+            LOG.info(f"Successfully downloaded log to {output_file}")
+            return output_file, None, None
 
         except ApiException as e:
+            part_file.unlink(missing_ok=True)
             LOG.error(
                 f"Kubernetes API error executing nvidia-bug-report.sh in pod {pod_name}",
                 exc_info=True,
@@ -560,35 +974,149 @@ class LogCollector:
                        "root_cause": str(e)},
             )
             return None, BugReportError.EXEC_ERROR.code, BugReportError.EXEC_ERROR.message
+        except _ShutdownRequested:
+            part_file.unlink(missing_ok=True)
+            LOG.warning(f"Stopped bug report collection from pod {pod_name} because the collector is shutting down")
+            return None, BugReportError.SHUTTING_DOWN.code, BugReportError.SHUTTING_DOWN.message
         except TimeoutError as e:
+            part_file.unlink(missing_ok=True)
             LOG.error(
-                f"Timed out executing nvidia-bug-report.sh in pod {pod_name}",
+                f"Timed out collecting nvidia-bug-report from pod {pod_name}",
                 exc_info=True,
                 extra={"error_code": BugReportError.COLLECTION_TIMED_OUT.code,
                        "root_cause": str(e)},
             )
             return None, BugReportError.COLLECTION_TIMED_OUT.code, BugReportError.COLLECTION_TIMED_OUT.message
         except Exception as e:
+            part_file.unlink(missing_ok=True)
             LOG.error(
-                f"Unexpected error during nvidia-bug-report execution",
+                f"Unexpected error during nvidia-bug-report collection",
                 exc_info=True,
                 extra={"error_code": BugReportError.INTERNAL_ERROR.code,
                        "root_cause": str(e)},
             )
             return None, BugReportError.INTERNAL_ERROR.code, BugReportError.INTERNAL_ERROR.message
 
-    def execute_bug_report_local(self, event_id: Optional[str] = None) -> Tuple[Optional[Path], Optional[str], Optional[str]]:
+    def _stream_exec_to_file(self, pod_name: str, container_name: str, command: list, output_path: Path,
+                             deadline: float) -> Tuple[Optional[int], str]:
+        """
+        Run command in the pod over the API server's exec websocket, writing stdout to output_path.
+
+        Returns:
+            Tuple of (exit code or None if the stream ended without one, stderr output)
+
+        Raises:
+            _ShutdownRequested: SIGTERM arrived before or during the exec
+        """
+        if self._shutdown.is_set():
+            raise _ShutdownRequested("shutdown requested before exec")
+
+        # binary=True hands stdout back as raw bytes, written to disk as they arrive
+        resp = stream(
+            self.k8s_api.connect_get_namespaced_pod_exec,
+            pod_name,
+            self.driver_namespace,
+            container=container_name,
+            command=command,
+            stderr=True,
+            stdin=False,
+            stdout=True,
+            tty=False,
+            _preload_content=False,
+            binary=True
+        )
+
+        # The reader blocks on the websocket for the whole remaining deadline, so SIGTERM
+        # may raise out of that wait (and only that wait). Closing the stream hangs up the
+        # remote shell, whose trap removes the partial report from the pod.
+        reader = _ExecStreamReader(resp, timeout=max(deadline - time.monotonic(), 0),
+                                   interruptible=self._sigterm_interrupts)
+        try:
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while (chunk := reader.read_chunk()) is not None:
+                    _write_all(fd, chunk)
+                _drop_page_cache(fd)
+            finally:
+                os.close(fd)
+        finally:
+            reader.close()
+
+        return _exec_returncode(resp), reader.stderr
+
+    @contextlib.contextmanager
+    def _sigterm_interrupts(self):
+        """Let SIGTERM raise _ShutdownRequested for the duration of the block."""
+        self._interrupt_on_sigterm = True
+        try:
+            # A SIGTERM that arrived just before the flag was set would otherwise be missed
+            if self._shutdown.is_set():
+                raise _ShutdownRequested("shutdown requested during exec stream")
+            yield
+        finally:
+            self._interrupt_on_sigterm = False
+
+    def _run_local_script(self, cmd: list, deadline: Optional[float] = None, **popen_kwargs) -> subprocess.CompletedProcess:
+        """
+        Run a local bug report script, like subprocess.run(..., timeout=COLLECTION_TIMEOUT),
+        but also stop it promptly on SIGTERM instead of holding the pod until the timeout.
+
+        A stopped script gets SIGTERM and, if it is still running 5 seconds later, SIGKILL.
+
+        Args:
+            deadline: time.monotonic() value to stop the script at (defaults to
+                COLLECTION_TIMEOUT from now)
+
+        Raises:
+            subprocess.TimeoutExpired: The script was still running at the deadline; its
+                timeout is the budget the script was started with
+            _ShutdownRequested: SIGTERM arrived while the script was running
+        """
+        if deadline is None:
+            deadline = time.monotonic() + COLLECTION_TIMEOUT
+        budget = max(deadline - time.monotonic(), 0)
+        handler.flush()
+        with subprocess.Popen(cmd, **popen_kwargs) as proc:
+            while True:
+                try:
+                    stdout, stderr = proc.communicate(timeout=1)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                if self._shutdown.is_set():
+                    self._stop_local_script(proc)
+                    raise _ShutdownRequested(f"{cmd[0]} stopped by shutdown")
+                if time.monotonic() >= deadline:
+                    self._stop_local_script(proc)
+                    raise subprocess.TimeoutExpired(cmd, budget)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    @staticmethod
+    def _stop_local_script(proc: subprocess.Popen) -> None:
+        proc.terminate()
+        try:
+            proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+
+    def execute_bug_report_local(self, event_id: Optional[str] = None,
+                                 deadline: Optional[float] = None) -> Tuple[Optional[Path], Optional[str], Optional[str]]:
         """
         Execute bug report script locally (bundled in container).
         Works for both NVIDIA and AMD GPUs, in both K8s (bundled mode) and VM environments.
 
         Args:
             event_id: Optional event ID to include in filename
+            deadline: time.monotonic() value the collection must finish by, compression
+                included (defaults to COLLECTION_TIMEOUT from now)
 
         Returns:
             Path to generated log file, or None on error
         """
         LOG.info(f"Executing bug report locally for {self.gpu_type.upper()} (bundled driver mode)")
+        if deadline is None:
+            deadline = time.monotonic() + COLLECTION_TIMEOUT
 
         # Determine which script to run based on GPU type.
         if self.gpu_type == "amd":
@@ -605,7 +1133,7 @@ class LogCollector:
 
         try:
             # Generate unique filename with timestamp and optional event_id
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _report_timestamp()
             if event_id:
                 log_filename_base = f"{self.gpu_type}-bug-report-{self.node_name}-{event_id}-{timestamp}.log"
             else:
@@ -632,31 +1160,33 @@ class LogCollector:
                     # rocm_techsupport.sh takes no arguments and writes its report to stdout.
                     env = {**os.environ,
                            "PATH": f"/opt/rocm/bin:{os.environ.get('PATH', '')}"}
-                    LOG.info(f"Running command: {script_path} (stdout -> {log_path_base})")
+                    LOG.info("Running command: %s (stdout -> %s)", script_path, log_path_base)
 
                     partial = False
                     with open(log_path_base, "wb") as out:
                         try:
-                            subprocess.run(
+                            self._run_local_script(
                                 [str(script_path)],
+                                deadline=deadline - AMD_COMPRESS_RESERVE,
                                 stdout=out,
                                 stderr=subprocess.STDOUT,
                                 env=env,
-                                timeout=COLLECTION_TIMEOUT,
-                                check=False,
                             )
-                        except subprocess.TimeoutExpired:
+                        except subprocess.TimeoutExpired as e:
                             partial = True
                             LOG.warning(
-                                f"{script_path.name} timed out after {COLLECTION_TIMEOUT}s; "
+                                f"{script_path.name} did not finish within {e.timeout:.0f}s "
+                                f"(the collection timeout less {AMD_COMPRESS_RESERVE}s kept for compression); "
                                 f"saving partial report"
                             )
 
                     # Compress to "<path>.gz" (partial or complete) and drop the uncompressed copy.
-                    with open(log_path_base, "rb") as f_in, \
-                            gzip.open(actual_log_path, "wb") as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                    log_path_base.unlink(missing_ok=True)
+                    # Out of time to compress, the uncompressed report is returned instead of lost.
+                    try:
+                        _gzip_report(log_path_base, deadline)
+                    except TimeoutError as e:
+                        LOG.warning(f"{e}; keeping uncompressed report {log_path_base}")
+                        actual_log_path = log_path_base
 
                     if actual_log_path.exists() and actual_log_path.stat().st_size > 0:
                         LOG.info(
@@ -674,13 +1204,14 @@ class LogCollector:
                 # NVIDIA / GB200: the vendor script writes "<path>.gz" itself.
                 cmd = [str(script_path), "--output-file", str(log_path_base)]
 
-                LOG.info(f"Running command: {' '.join(cmd)}")
+                LOG.info("Running command: %s", " ".join(cmd))
 
-                result = subprocess.run(
+                result = self._run_local_script(
                     cmd,
-                    capture_output=True,
+                    deadline=deadline,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
                     text=True,
-                    timeout=COLLECTION_TIMEOUT
                 )
 
                 if result.returncode == 0 and actual_log_path.exists():
@@ -700,11 +1231,14 @@ class LogCollector:
                     LOG.debug("Restoring /usr/bin/mst from backup")
                     mst_backup_path.rename(mst_path)
 
-        except subprocess.TimeoutExpired:
+        except _ShutdownRequested:
+            LOG.warning(f"Stopped {script_path.name} because the collector is shutting down")
+            return None, BugReportError.SHUTTING_DOWN.code, BugReportError.SHUTTING_DOWN.message
+        except subprocess.TimeoutExpired as e:
             LOG.error(
                 f"Bug report timed out",
                 extra={"error_code": BugReportError.SCRIPT_TIMED_OUT.code,
-                       "root_cause": f"Bug report generation timed out after {COLLECTION_TIMEOUT}s"},
+                       "root_cause": f"Bug report generation timed out after {e.timeout:.0f}s"},
             )
             return None, BugReportError.SCRIPT_TIMED_OUT.code, BugReportError.SCRIPT_TIMED_OUT.message
         except Exception as e:
@@ -716,308 +1250,75 @@ class LogCollector:
             )
             return None, BugReportError.INTERNAL_ERROR.code, BugReportError.INTERNAL_ERROR.message
 
-    def download_log_file(self, pod, remote_path: str) -> Tuple[Optional[Path], Optional[str], Optional[str]]:
-        """
-        Download the log file from the driver pod using tar (K8s only).
-
-        Args:
-            pod: The NVIDIA driver pod
-            remote_path: Path to the log file in the pod
-
-        Returns:
-            Tuple of (path to downloaded file, error_code, error_message).
-            On success: (Path, None, None). On failure: (None, "CWA-BR-NNNN", "user-facing message").
-        """
-        if self.environment != "kubernetes":
-            return None, None, None
-
-        pod_name = pod.metadata.name
-        container_name = self._get_driver_container_name(pod)
-
-        if not container_name:
-            LOG.error(
-                f"Could not find suitable container in pod {pod_name}",
-                extra={"error_code": BugReportError.DRIVER_POD_NOT_FOUND.code,
-                       "root_cause": f"No suitable container found in pod {pod_name}"},
-            )
-            return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-
-        LOG.info(f"Downloading {remote_path} from pod {pod_name}")
-
-        try:
-            # First verify the file exists
-            LOG.debug(f"Verifying file exists: {remote_path}")
-            check_command = f"test -f {shlex.quote(remote_path)} && echo EXISTS"
-
-            resp = stream(
-                self.k8s_api.connect_get_namespaced_pod_exec,
-                pod_name,
-                self.driver_namespace,
-                container=container_name,
-                command=["/bin/sh", "-c", check_command],
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=False
-            )
-
-            if "EXISTS" not in resp:
-                LOG.error(
-                    f"File does not exist",
-                    extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                           "root_cause": f"Failed to download log file from driver pod {pod_name}: file not found at {remote_path}"},
-                )
-                # List files in /tmp to help debug
-                list_resp = stream(
-                    self.k8s_api.connect_get_namespaced_pod_exec,
-                    pod_name,
-                    self.driver_namespace,
-                    container=container_name,
-                    command=["ls", "-lh", "/tmp/"],
-                    stderr=True,
-                    stdin=False,
-                    stdout=True,
-                    tty=False
-                )
-                LOG.debug(f"Files in /tmp:\n{list_resp}")
-                return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-
-            remote_dir = os.path.dirname(remote_path)
-            remote_file = os.path.basename(remote_path)
-            exec_command = [
-                "/bin/sh", "-c",
-                f"tar -C {shlex.quote(remote_dir)} -cf - {shlex.quote(remote_file)} | base64"
-            ]
-
-            LOG.debug(f"Running command: {exec_command[2]}")
-
-            resp = stream(
-                self.k8s_api.connect_get_namespaced_pod_exec,
-                pod_name,
-                self.driver_namespace,
-                container=container_name,
-                command=exec_command,
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=False,
-                _preload_content=False
-            )
-
-            stdout_output, stderr_output = self._read_exec_stream(resp)
-            LOG.debug(f"Received {len(stdout_output)} base64 chars from pod {pod_name} for {remote_path}")
-
-            if stdout_output:
-                LOG.debug(f"Received base64 data, decoding...")
-                try:
-                    tar_data = base64.b64decode(stdout_output)
-                except Exception as e:
-                    LOG.error(
-                        f"Failed to decode base64 data from pod {pod_name}",
-                        exc_info=True,
-                        extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                               "root_cause": f"{e}; received {len(stdout_output)} base64 chars; stderr={stderr_output[-500:]!r}"},
-                    )
-                    return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-            else:
-                LOG.error(
-                    f"No data received when downloading {remote_path} from pod {pod_name}",
-                    extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                           "root_cause": f"Failed to download log file from driver pod {pod_name}: empty response"},
-                )
-                return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-
-            LOG.debug(f"Decoded {len(tar_data)} bytes of tar data")
-
-            # Extract tar to output directory
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".tar") as tmp_tar:
-                tmp_tar.write(tar_data)
-                tmp_tar_path = tmp_tar.name
-
-            try:
-                with tarfile.open(tmp_tar_path, 'r') as tar:
-                    # List members for debugging
-                    members = tar.getmembers()
-                    LOG.debug(f"Tar contains {len(members)} members: {[m.name for m in members]}")
-
-                    # Extract the file (it should just be the filename without path now)
-                    member = tar.getmember(remote_file)
-                    tar.extract(member, path=self.output_dir)
-
-                output_file = self.output_dir / remote_file
-                LOG.info(f"Successfully downloaded log to {output_file}")
-                return output_file, None, None
-
-            finally:
-                os.unlink(tmp_tar_path)
-
-        except ApiException as e:
-            LOG.error(
-                f"Kubernetes API error downloading log file from pod {pod_name}",
-                exc_info=True,
-                extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                       "root_cause": str(e)},
-            )
-            return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-        except tarfile.TarError as e:
-            LOG.error(
-                f"Error extracting tar file from pod {pod_name}",
-                exc_info=True,
-                extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                       "root_cause": str(e)},
-            )
-            return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-        except KeyError as e:
-            LOG.error(
-                f"File not found in tar archive from pod {pod_name}",
-                exc_info=True,
-                extra={"error_code": BugReportError.DOWNLOAD_FAILED.code,
-                       "root_cause": str(e)},
-            )
-            return None, BugReportError.DOWNLOAD_FAILED.code, BugReportError.DOWNLOAD_FAILED.message
-        except TimeoutError as e:
-            LOG.error(
-                f"Timed out downloading log file from pod {pod_name}",
-                exc_info=True,
-                extra={"error_code": BugReportError.COLLECTION_TIMED_OUT.code,
-                       "root_cause": str(e)},
-            )
-            return None, BugReportError.COLLECTION_TIMED_OUT.code, BugReportError.COLLECTION_TIMED_OUT.message
-        except Exception as e:
-            LOG.error(
-                f"Unexpected error downloading log file from pod {pod_name}",
-                exc_info=True,
-                extra={"error_code": BugReportError.INTERNAL_ERROR.code,
-                       "root_cause": str(e)},
-            )
-            return None, BugReportError.INTERNAL_ERROR.code, BugReportError.INTERNAL_ERROR.message
-
-    def _read_exec_stream(self, resp, timeout: int = COLLECTION_TIMEOUT) -> Tuple[str, str]:
-        stdout_output = ""
-        stderr_output = ""
-        # resp.update(timeout=1) only bounds a single poll, not the total wait.
-        # Without an overall deadline a hung exec (stream never closes) would spin
-        # this loop forever; because collect_logs runs in an abandoned daemon thread,
-        # that leaks the thread and websocket connection rather than blocking the request.
-        deadline = time.monotonic() + timeout
-        try:
-            while resp.is_open():
-                if time.monotonic() > deadline:
-                    raise TimeoutError(
-                        f"Timed out reading exec stream after {timeout}s "
-                        f"(received {len(stdout_output)} stdout / {len(stderr_output)} stderr chars)"
-                    )
-                resp.update(timeout=1)
-                if resp.peek_stdout():
-                    stdout_output += resp.read_stdout()
-                if resp.peek_stderr():
-                    chunk = resp.read_stderr()
-                    if chunk:
-                        stderr_output += chunk
-        finally:
-            resp.close()
-        return stdout_output, stderr_output
-
-    def cleanup_remote_log(self, pod, remote_path: str) -> bool:
-        """
-        Clean up the temporary log file from the driver pod (K8s only).
-
-        Args:
-            pod: The NVIDIA driver pod
-            remote_path: Path to the log file to remove
-
-        Returns:
-            True if cleanup successful, False otherwise
-        """
-        if self.environment != "kubernetes":
-            return False
-
-        pod_name = pod.metadata.name
-        container_name = self._get_driver_container_name(pod)
-
-        if not container_name:
-            return False
-
-        LOG.info(f"Cleaning up {remote_path} from pod {pod_name}")
-
-        try:
-            # Delete the file and verify it's gone
-            quoted_remote_path = shlex.quote(remote_path)
-            exec_command = [
-                "/bin/sh", "-c",
-                f"rm -f {quoted_remote_path} && if [ -f {quoted_remote_path} ]; then echo 'STILL_EXISTS'; else echo 'DELETED'; fi"
-            ]
-
-            resp = stream(
-                self.k8s_api.connect_get_namespaced_pod_exec,
-                pod_name,
-                self.driver_namespace,
-                container=container_name,
-                command=exec_command,
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=False
-            )
-
-            if "DELETED" in resp:
-                LOG.info(f"Successfully cleaned up {remote_path}")
-                return True
-            elif "STILL_EXISTS" in resp:
-                LOG.error(f"File still exists after deletion attempt: {remote_path}")
-                return False
-            else:
-                LOG.warning(f"Unexpected cleanup response: {resp}")
-                return False
-
-        except Exception as e:
-            LOG.warning(f"Error cleaning up remote log file (non-critical): {e}")
-            return False
-
-    def _cleanup_logs_by_pattern(self, pattern: str, log_type: str) -> None:
+    def _cleanup_log_entries(self, entries: list, log_type: str) -> None:
         """
-        Helper method to clean up log files matching a pattern.
+        Helper method to remove the oldest of one kind of log file.
 
         Args:
-            pattern: Glob pattern to match log files
+            entries: (mtime, size, path) tuples for the files of this kind
             log_type: Description of log type for logging (e.g., "compressed", "unzipped")
         """
-        log_files = sorted(
-            self.output_dir.glob(pattern),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True  # Newest first
-        )
-
-        if not log_files:
-            LOG.debug(f"No existing {log_type} log files found to clean up")
+        if not entries:
+            LOG.debug("No existing %s log files found to clean up", log_type)
             return
 
-        total_files = len(log_files)
-        files_to_keep = log_files[:MAX_LOGS_TO_KEEP]
-        files_to_delete = log_files[MAX_LOGS_TO_KEEP:]
+        total_files = len(entries)
+
+        # Keep the newest files within both the count and the byte budget (always at least one).
+        # Only the MAX_LOGS_TO_KEEP newest can be kept, so select those instead of sorting everything.
+        kept_paths = set()
+        kept_bytes = 0
+        for _, file_size, path in heapq.nlargest(MAX_LOGS_TO_KEEP, entries, key=lambda e: e[0]):
+            if kept_paths and kept_bytes + file_size > MAX_LOGS_BYTES:
+                break
+            kept_paths.add(path)
+            kept_bytes += file_size
+        keep_count = len(kept_paths)
+        files_to_delete = [e for e in entries if e[2] not in kept_paths]
 
         if files_to_delete:
-            LOG.info(f"Found {total_files} {log_type} log files, keeping {len(files_to_keep)}, removing {len(files_to_delete)} old logs")
+            LOG.info(f"Found {total_files} {log_type} log files, keeping {keep_count} ({kept_bytes / (1024*1024):.2f} MB), removing {len(files_to_delete)} old logs")
 
-            for log_file in files_to_delete:
+            for _, file_size, path in files_to_delete:
+                name = os.path.basename(path)
                 try:
-                    file_size = log_file.stat().st_size
-                    log_file.unlink()
-                    LOG.info(f"Deleted old {log_type} log: {log_file.name} ({file_size / (1024*1024):.2f} MB)")
+                    os.unlink(path)
+                    LOG.info(f"Deleted old {log_type} log: {name} ({file_size / (1024*1024):.2f} MB)")
                 except Exception as e:
-                    LOG.warning(f"Failed to delete {log_file.name}: {e}")
+                    LOG.warning(f"Failed to delete {name}: {e}")
         else:
-            LOG.debug(f"No {log_type} log cleanup needed, only {total_files} files found (max: {MAX_LOGS_TO_KEEP})")
+            LOG.debug("No %s log cleanup needed, only %d files found (max: %d)", log_type, total_files, MAX_LOGS_TO_KEEP)
 
     def cleanup_old_logs(self) -> None:
         """
         Clean up old log files to prevent disk space issues.
-        Keeps only the most recent MAX_LOGS_TO_KEEP files.
-        Cleans up both compressed (.log.gz) and unzipped (.log) files in the output directory.
+        Keeps only the most recent MAX_LOGS_TO_KEEP files, and fewer if they would
+        add up to more than MAX_LOGS_BYTES.
+        Cleans up compressed (.log.gz) and unzipped (.log) files in the output directory,
+        plus the .dup markers left by report deduplication.
+
+        The directory is scanned once and each matching file is stat'ed once.
         """
+        patterns = (
+            (f"{self.gpu_type}-bug-report-*.log.gz", "compressed"),
+            (f"{self.gpu_type}-bug-report-*.log", "unzipped"),
+            (f"{self.gpu_type}-bug-report-*.dup", "duplicate marker"),
+        )
         try:
-            self._cleanup_logs_by_pattern(f"{self.gpu_type}-bug-report-*.log.gz", "compressed")
-            self._cleanup_logs_by_pattern(f"{self.gpu_type}-bug-report-*.log", "unzipped")
+            matched = {log_type: [] for _, log_type in patterns}
+            with os.scandir(self.output_dir) as it:
+                for entry in it:
+                    for pattern, log_type in patterns:
+                        if fnmatch.fnmatchcase(entry.name, pattern):
+                            try:
+                                st = entry.stat()
+                            except FileNotFoundError:
+                                break
+                            matched[log_type].append((st.st_mtime, st.st_size, entry.path))
+                            break
+
+            for _, log_type in patterns:
+                self._cleanup_log_entries(matched[log_type], log_type)
         except Exception as e:
             LOG.warning(f"Error during log cleanup (non-critical): {e}")
 
@@ -1035,6 +1336,8 @@ class LogCollector:
         LOG.info(
             f"Starting log collection cycle ({self.environment} mode, node {self.node_name})", 
         )
+        # One budget for the whole collection: every step gets what is left of it
+        deadline = time.monotonic() + COLLECTION_TIMEOUT
 
         # Clean up old logs to prevent disk space issues
         self.cleanup_old_logs()
@@ -1045,7 +1348,7 @@ class LogCollector:
             # Execute bug report locally (bundled in container)
             # This path is used by: VMs, AMD in K8s, GB200 in K8s
             LOG.info("Using bundled driver mode") 
-            local_log_path, error_code, error_msg = self.execute_bug_report_local(event_id)
+            local_log_path, error_code, error_msg = self.execute_bug_report_local(event_id, deadline=deadline)
 
             if not local_log_path:
                 return None, error_code, error_msg
@@ -1056,80 +1359,58 @@ class LogCollector:
             if not driver_pod:
                 return None, BugReportError.DRIVER_POD_NOT_FOUND.code, BugReportError.DRIVER_POD_NOT_FOUND.message
 
-            remote_log_path, error_code, error_msg = self.execute_nvidia_bug_report(driver_pod, event_id)
-            if not remote_log_path:
-                return None, error_code, error_msg
+            if self._shutdown.is_set():
+                return None, BugReportError.SHUTTING_DOWN.code, BugReportError.SHUTTING_DOWN.message
 
-            try:
-                local_log_path, error_code, error_msg = self.download_log_file(driver_pod, remote_log_path)
-                if not local_log_path:
-                    return None, error_code, error_msg
-            finally:
-                self.cleanup_remote_log(driver_pod, remote_log_path)
+            local_log_path, error_code, error_msg = self.run_and_fetch(driver_pod, event_id, deadline=deadline)
+            if not local_log_path:
+                return None, error_code, error_msg
 
         LOG.info(f"Log collection completed successfully: {local_log_path} ({local_log_path.stat().st_size / (1024*1024):.2f} MB)")
+
+        # Requested (API) collections always keep their own report
+        if DEDUPLICATE_REPORTS and event_id is None:
+            local_log_path = self._deduplicate_report(local_log_path)
+
         return local_log_path, None, None
 
-    def collect_logs_with_timeout(self, event_id: str) -> Tuple[bool, Optional[Path], Optional[str], Optional[str]]:
+    def _deduplicate_report(self, log_path: Path) -> Path:
         """
-        Collect logs with timeout handling.
+        Drop a scheduled bug report that is byte-identical to the previous one.
+
+        The new file is replaced by a small .dup marker naming the earlier report,
+        which stays in place. Only applies while that earlier report still exists.
 
         Args:
-            event_id: Event ID for this collection task
+            log_path: Newly collected report
 
         Returns:
-            Tuple of (success, log_path, error_code, error_message).
-            On success: (True, Path, None, None). On failure: (False, None, "CWA-BR-NNNN", "user-facing message").
+            The report to treat as this cycle's result
         """
-        import threading
-        from contextvars import copy_context
-
-        result = {"log_path": None, "error_code": None, "error_msg": None, "completed": False}
-        ctx = copy_context()
+        state_file = self.output_dir / "last_report_hash.json"
+        try:
+            with open(log_path, "rb") as f:
+                report_hash = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
 
-        def collection_target():
             try:
-                log_path, error_code, error_msg = self.collect_logs(event_id)
-                result["log_path"] = log_path
-                result["error_code"] = error_code
-                result["error_msg"] = error_msg
-                result["completed"] = True
-            except Exception as e:
-                LOG.error(
-                    f"Unexpected exception in collection thread",
-                    exc_info=True,
-                    extra={"error_code": BugReportError.INTERNAL_ERROR.code,
-                           "root_cause": str(e) or repr(e)},
-                )
-                result["error_code"] = BugReportError.INTERNAL_ERROR.code
-                result["error_msg"] = "Internal Server Error"
-                result["completed"] = True
-
-        thread = threading.Thread(target=lambda: ctx.run(collection_target), daemon=True)
-        thread.start()
-        thread.join(timeout=COLLECTION_TIMEOUT)
-
-        if not result["completed"]:
-            LOG.error(
-                f"Collection timed out",
-                extra={"error_code": BugReportError.COLLECTION_TIMED_OUT.code,
-                       "root_cause": f"Collection timeout after {COLLECTION_TIMEOUT} seconds"},
-            )
-            return False, None, BugReportError.COLLECTION_TIMED_OUT.code, BugReportError.COLLECTION_TIMED_OUT.message
-
-        if result["error_msg"]:
-            return False, None, result["error_code"], result["error_msg"]
-
-        if result["log_path"]:
-            return True, result["log_path"], None, None
-
-        LOG.error(
-            "Collection Failed",
-            exc_info = True,
-            extra={"error_code": BugReportError.INTERNAL_ERROR.code,
-                   "root_cause": "collection_target returned without log_path or error_msg"},
-        )
-        return False, None, BugReportError.INTERNAL_ERROR.code, BugReportError.INTERNAL_ERROR.message
+                previous = json.loads(state_file.read_text())
+            except (OSError, ValueError):
+                previous = {}
+
+            previous_name = previous.get("file")
+            if previous.get("hash") == report_hash and previous_name and previous_name != log_path.name:
+                previous_path = self.output_dir / previous_name
+                if previous_path.exists():
+                    log_path.unlink()
+                    marker = log_path.with_name(log_path.name + ".dup")
+                    marker.write_text(previous_name + "\n")
+                    LOG.info(f"Bug report is identical to {previous_name}, kept marker {marker.name} instead")
+                    return previous_path
+
+            state_file.write_text(json.dumps({"hash": report_hash, "file": log_path.name}))
+        except OSError as e:
+            LOG.warning(f"Error during report deduplication (non-critical): {e}")
+        return log_path
 
     def _get_driver_container_name(self, pod) -> Optional[str]:
         """
@@ -1144,19 +1425,38 @@ class LogCollector:
         if self.environment != "kubernetes":
             return None
 
+        pod_uid = pod.metadata.uid
+        if pod_uid in self._container_name_cache:
+            return self._container_name_cache[pod_uid]
+
+        container_name = None
+
         # Try to find a container with 'driver' in the name
         for container in pod.spec.containers:
             if "driver" in container.name.lower():
-                return container.name
-
-        # If not found, use the first container
-        if pod.spec.containers:
-            return pod.spec.containers[0].name
-
-        return None
+                container_name = container.name
+                break
+        else:
+            # If not found, use the first container
+            if pod.spec.containers:
+                container_name = pod.spec.containers[0].name
+
+        if container_name is not None:
+            self._container_name_cache[pod_uid] = container_name
+        return container_name
+
+    def handle_sigterm(self, signum, frame):
+        LOG.info("Received SIGTERM, shutting down after the current collection step")
+        self._shutdown.set()
+        if self._interrupt_on_sigterm:
+            # Cleared here too, in case the signal lands before the window's own reset
+            self._interrupt_on_sigterm = False
+            raise _ShutdownRequested("SIGTERM during exec stream")
 
     def run(self):
         """Main execution loop."""
+        signal.signal(signal.SIGTERM, self.handle_sigterm)
+
         LOG.info(f"{self.gpu_type.upper()} Log Collector started")
         LOG.info(f"Environment: {self.environment}")
         LOG.info(f"Node/Host: {self.node_name}")
@@ -1194,7 +1494,7 @@ class LogCollector:
             LOG.error("VM_ID not set - cannot run in API-driven mode")
             sys.exit(1)
 
-        while True:
+        while not self._shutdown.is_set():
             try:
                 # Check if there's a task to process
                 task = self.check_for_tasks()
@@ -1204,10 +1504,21 @@ class LogCollector:
                     set_log_context(event_id=event_id)
                     LOG.info(f"Processing collection task")
 
-                    # Collect logs with timeout
-                    success, log_path, error_code, error_msg = self.collect_logs_with_timeout(event_id)
+                    # Every step of a collection is bounded by its own timeout (API calls,
+                    # the exec stream deadline, the local script's subprocess timeout),
+                    # so it runs inline rather than on a thread that could be left behind.
+                    try:
+                        log_path, error_code, error_msg = self.collect_logs(event_id)
+                    except Exception as e:
+                        LOG.error(
+                            f"Unexpected exception during collection",
+                            exc_info=True,
+                            extra={"error_code": BugReportError.INTERNAL_ERROR.code,
+                                   "root_cause": str(e) or repr(e)},
+                        )
+                        log_path, error_code, error_msg = None, BugReportError.INTERNAL_ERROR.code, BugReportError.INTERNAL_ERROR.message
 
-                    if success and log_path:
+                    if log_path:
                         # Report success and upload logs in a single call
                         LOG.info("Reporting success and uploading logs")
                         upload_success = self.report_result(event_id, "success", log_file=log_path)
@@ -1240,15 +1551,26 @@ class LogCollector:
                                  "root_cause": str(e)})
                 clear_log_context()
 
-            # Wait before polling again
-            time.sleep(API_POLL_INTERVAL)
+            # Wait before polling again, backing off while the API is failing.
+            # SIGTERM ends the wait at once.
+            delay = self._next_poll_delay()
+            if self._poll_failures:
+                LOG.info(f"API poll failed {self._poll_failures} time(s) in a row, next poll in {delay:.0f}s")
+            handler.flush()
+            self._shutdown.wait(delay)
+
+        LOG.info("API polling stopped")
 
     def _run_scheduled_mode(self):
         """Run in scheduled mode - collect logs at regular intervals."""
         LOG.info(f"Running in scheduled mode")
         LOG.info(f"Collection interval: {COLLECTION_INTERVAL}s")
 
-        while True:
+        # Wake on fixed boundaries measured from startup, so the time a collection
+        # takes doesn't push every later one back.
+        next_deadline = time.monotonic()
+
+        while not self._shutdown.is_set():
             try:
                 log_path, error_code, error_msg = self.collect_logs()
                 if error_msg:
@@ -1263,8 +1585,20 @@ class LogCollector:
                     extra={"error_code": BugReportError.INTERNAL_ERROR.code, "root_cause": str(e) or repr(e)},
                 )
 
-            LOG.info(f"Sleeping for {COLLECTION_INTERVAL} seconds until next collection")
-            time.sleep(COLLECTION_INTERVAL)
+            next_deadline += COLLECTION_INTERVAL
+            now = time.monotonic()
+            if next_deadline <= now:
+                # Overran one or more intervals: skip the missed cycles rather than running them back to back
+                missed = int((now - next_deadline) // COLLECTION_INTERVAL) + 1
+                next_deadline += missed * COLLECTION_INTERVAL
+                LOG.warning(f"Collection overran the {COLLECTION_INTERVAL}s interval, skipping {missed} cycle(s)")
+
+            sleep_for = next_deadline - now
+            LOG.info(f"Sleeping for {sleep_for:.0f} seconds until next collection")
+            handler.flush()
+            self._shutdown.wait(sleep_for)
+
+        LOG.info("Scheduled collection stopped")
 
 
 def main():
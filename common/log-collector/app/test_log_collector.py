@@ -4,13 +4,16 @@ Unit tests for Unified Log Collector (K8s and VM)
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock, mock_open
+from unittest.mock import ANY, Mock, patch, MagicMock, mock_open
 import tempfile
 import os
-import base64
-import io
+import shutil
 import itertools
-import tarfile
+import gzip
+import json
+import logging
+import socket
+import urllib3
 from pathlib import Path
 
 # Set minimal required environment variables before importing the module
@@ -23,37 +26,26 @@ import log_collector
 from log_collector import LogCollector
 
 
+def tearDownModule():
+    shutil.rmtree(log_collector.LOG_OUTPUT_DIR, ignore_errors=True)
+
+
 class TestLogCollector(unittest.TestCase):
     """Test cases for LogCollector class."""
 
     def setUp(self):
         """Set up test fixtures."""
         self.output_dir = tempfile.mkdtemp()
-        # Store original environment variables
-        self.original_env = {
-            'NODE_NAME': os.environ.get('NODE_NAME'),
-            'LOG_OUTPUT_DIR': os.environ.get('LOG_OUTPUT_DIR'),
-            'GPU_TYPE': os.environ.get('GPU_TYPE'),
-            'DRIVER_NAMESPACE': os.environ.get('DRIVER_NAMESPACE'),
-            'VM_ID': os.environ.get('VM_ID'),
-            'API_ENABLED': os.environ.get('API_ENABLED'),
-        }
-
-        # Set test environment
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['LOG_OUTPUT_DIR'] = self.output_dir
-        os.environ['GPU_TYPE'] = 'nvidia'
-        os.environ['DRIVER_NAMESPACE'] = 'nvidia-gpu-operator'
-
-    def tearDown(self):
-        """Clean up after tests."""
-        # Restore original environment variables
-        for key, value in self.original_env.items():
-            if value is None:
-                if key in os.environ:
-                    del os.environ[key]
-            else:
-                os.environ[key] = value
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        # Set test environment; the whole environment is restored on cleanup
+        env = patch.dict(os.environ, {
+            'NODE_NAME': 'test-node',
+            'LOG_OUTPUT_DIR': self.output_dir,
+            'GPU_TYPE': 'nvidia',
+            'DRIVER_NAMESPACE': 'nvidia-gpu-operator',
+        })
+        env.start()
+        self.addCleanup(env.stop)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -76,6 +68,16 @@ class TestLogCollector(unittest.TestCase):
 
         self.assertEqual(collector.vm_id, 'test-vm-123')
 
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_k8s_client_uses_pooled_keepalive_connections(self, mock_core_api, mock_load_config):
+        """Test that the API client is built with a larger pool and TCP keepalive."""
+        LogCollector()
+
+        api_client = mock_core_api.call_args[0][0]
+        self.assertEqual(api_client.configuration.connection_pool_maxsize, 16)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), api_client.configuration.socket_options)
+
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_find_nvidia_driver_pod_by_label(self, mock_core_api, mock_load_config):
@@ -101,6 +103,7 @@ class TestLogCollector(unittest.TestCase):
         # Verify label selector was used
         call_kwargs = collector.k8s_api.list_namespaced_pod.call_args[1]
         self.assertEqual(call_kwargs['label_selector'], 'app.kubernetes.io/component=nvidia-driver')
+        self.assertEqual(call_kwargs['field_selector'], 'spec.nodeName=test-node,status.phase=Running')
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -154,40 +157,139 @@ class TestLogCollector(unittest.TestCase):
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_get_driver_container_name(self, mock_core_api, mock_load_config):
-        """Test getting driver container name."""
+    def test_find_nvidia_driver_pod_reuses_cached_pod(self, mock_core_api, mock_load_config):
+        """Test that a found driver pod is re-read by name instead of listing again."""
         collector = LogCollector()
 
-        # Mock pod with multiple containers
-        mock_container1 = Mock()
-        mock_container1.name = 'toolkit'
+        mock_pod = Mock()
+        mock_pod.metadata.name = 'nvidia-driver-daemonset-abc123'
+        mock_pod.status.phase = 'Running'
+
+        mock_pod_list = Mock()
+        mock_pod_list.items = [mock_pod]
 
-        mock_container2 = Mock()
-        mock_container2.name = 'nvidia-driver-ctr'
+        collector.k8s_api.list_namespaced_pod = Mock(return_value=mock_pod_list)
+        collector.k8s_api.read_namespaced_pod = Mock(return_value=mock_pod)
 
-        mock_pod = Mock()
-        mock_pod.spec.containers = [mock_container1, mock_container2]
+        first = collector.find_nvidia_driver_pod()
+        second = collector.find_nvidia_driver_pod()
+
+        self.assertIs(first, mock_pod)
+        self.assertIs(second, mock_pod)
+        self.assertEqual(collector.k8s_api.list_namespaced_pod.call_count, 1)
+        list_kwargs = collector.k8s_api.list_namespaced_pod.call_args[1]
+        self.assertEqual(list_kwargs['resource_version'], '0')
+        collector.k8s_api.read_namespaced_pod.assert_called_once_with(
+            name='nvidia-driver-daemonset-abc123',
+            namespace='nvidia-gpu-operator',
+            _request_timeout=10
+        )
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_find_nvidia_driver_pod_relists_when_cached_pod_is_gone(self, mock_core_api, mock_load_config):
+        """Test that a 404 on the cached pod drops the cache and lists again."""
+        collector = LogCollector()
+
+        old_pod = Mock()
+        old_pod.metadata.name = 'nvidia-driver-daemonset-old'
+        old_pod.status.phase = 'Running'
+        new_pod = Mock()
+        new_pod.metadata.name = 'nvidia-driver-daemonset-new'
+        new_pod.status.phase = 'Running'
+
+        old_list = Mock()
+        old_list.items = [old_pod]
+        new_list = Mock()
+        new_list.items = [new_pod]
+
+        collector.k8s_api.list_namespaced_pod = Mock(side_effect=[old_list, new_list])
+        collector.k8s_api.read_namespaced_pod = Mock(side_effect=log_collector.ApiException(status=404))
+
+        self.assertIs(collector.find_nvidia_driver_pod(), old_pod)
+        self.assertIs(collector.find_nvidia_driver_pod(), new_pod)
+        self.assertEqual(collector.k8s_api.list_namespaced_pod.call_count, 2)
+
+    @patch('log_collector.NVIDIA_DRIVER_POD_NAME_TEMPLATE', 'nvidia-gpu-driver-daemonset-{node}')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_find_nvidia_driver_pod_by_name_template(self, mock_core_api, mock_load_config):
+        """Test that a configured name template reads the pod directly, falling back to a list on 404."""
+        collector = LogCollector()
+
+        named_pod = Mock()
+        named_pod.metadata.name = 'nvidia-gpu-driver-daemonset-test-node'
+        named_pod.status.phase = 'Running'
+
+        collector.k8s_api.list_namespaced_pod = Mock()
+        collector.k8s_api.read_namespaced_pod = Mock(return_value=named_pod)
+
+        self.assertIs(collector.find_nvidia_driver_pod(), named_pod)
+        collector.k8s_api.list_namespaced_pod.assert_not_called()
+        collector.k8s_api.read_namespaced_pod.assert_called_once_with(
+            name='nvidia-gpu-driver-daemonset-test-node',
+            namespace='nvidia-gpu-operator',
+            _request_timeout=10
+        )
+
+        # No pod by that name: the label lookup is used instead
+        collector._cached_driver_pod = None
+        listed_pod = Mock()
+        listed_pod.metadata.name = 'nvidia-driver-daemonset-abc123'
+        listed_pod.status.phase = 'Running'
+        pod_list = Mock()
+        pod_list.items = [listed_pod]
+        collector.k8s_api.list_namespaced_pod = Mock(return_value=pod_list)
+        collector.k8s_api.read_namespaced_pod = Mock(side_effect=log_collector.ApiException(status=404))
 
-        result = collector._get_driver_container_name(mock_pod)
+        self.assertIs(collector.find_nvidia_driver_pod(), listed_pod)
+        collector.k8s_api.list_namespaced_pod.assert_called_once()
 
-        self.assertEqual(result, 'nvidia-driver-ctr')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_get_driver_container_name(self, mock_core_api, mock_load_config):
+        """Test getting driver container name, falling back to the first container."""
+        collector = LogCollector()
+
+        cases = (
+            (['toolkit', 'nvidia-driver-ctr'], 'nvidia-driver-ctr'),
+            # No 'driver' in container names
+            (['main-container'], 'main-container'),
+        )
+        for names, expected in cases:
+            with self.subTest(containers=names):
+                containers = []
+                for name in names:
+                    container = Mock()
+                    container.name = name
+                    containers.append(container)
+                mock_pod = Mock()
+                mock_pod.spec.containers = containers
+
+                self.assertEqual(collector._get_driver_container_name(mock_pod), expected)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_get_driver_container_name_fallback(self, mock_core_api, mock_load_config):
-        """Test getting driver container name with fallback."""
+    def test_get_driver_container_name_is_memoized_per_pod_uid(self, mock_core_api, mock_load_config):
+        """Test that the container name is computed once per pod UID."""
         collector = LogCollector()
 
-        # Mock pod with no 'driver' in container names
         mock_container = Mock()
-        mock_container.name = 'main-container'
+        mock_container.name = 'nvidia-driver-ctr'
 
         mock_pod = Mock()
+        mock_pod.metadata.uid = 'uid-1'
         mock_pod.spec.containers = [mock_container]
 
-        result = collector._get_driver_container_name(mock_pod)
+        self.assertEqual(collector._get_driver_container_name(mock_pod), 'nvidia-driver-ctr')
+
+        # Same UID: the cached name is returned without looking at the spec again
+        mock_pod.spec.containers = []
+        self.assertEqual(collector._get_driver_container_name(mock_pod), 'nvidia-driver-ctr')
 
-        self.assertEqual(result, 'main-container')
+        # New UID (pod recreated): looked up afresh
+        mock_pod.metadata.uid = 'uid-2'
+        self.assertIsNone(collector._get_driver_container_name(mock_pod))
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -208,25 +310,112 @@ class TestLogCollector(unittest.TestCase):
         self.assertEqual(len(remaining_files), 1)
 
 
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_cleanup_old_logs_respects_byte_budget(self, mock_core_api, mock_load_config):
+        """Test that cleanup also drops older logs once the byte budget is exceeded."""
+        collector = LogCollector()
+        for stale in collector.output_dir.glob("nvidia-bug-report-*.log.gz"):
+            stale.unlink()
+
+        for i in range(5):
+            log_file = collector.output_dir / f"nvidia-bug-report-node-{i}.log.gz"
+            log_file.write_bytes(b'x' * 100)
+            os.utime(log_file, (1000 + i, 1000 + i))
+
+        with patch.object(log_collector, 'MAX_LOGS_TO_KEEP', 5), patch.object(log_collector, 'MAX_LOGS_BYTES', 250):
+            collector.cleanup_old_logs()
+
+        remaining = sorted(p.name for p in collector.output_dir.glob("nvidia-bug-report-*.log.gz"))
+        self.assertEqual(remaining, ["nvidia-bug-report-node-3.log.gz", "nvidia-bug-report-node-4.log.gz"])
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_cleanup_old_logs_keeps_newest_of_each_kind(self, mock_core_api, mock_load_config):
+        """Test that compressed and unzipped reports are budgeted separately from one directory scan."""
+        collector = LogCollector()
+        collector.output_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, collector.output_dir, ignore_errors=True)
+
+        for i in range(3):
+            for suffix in ('.log.gz', '.log'):
+                log_file = collector.output_dir / f"nvidia-bug-report-node-{i}{suffix}"
+                log_file.touch()
+                os.utime(log_file, (1000 + i, 1000 + i))
+        (collector.output_dir / "unrelated.log").touch()
+
+        with patch.object(log_collector, 'MAX_LOGS_TO_KEEP', 1), \
+                patch('log_collector.os.scandir', wraps=os.scandir) as mock_scandir:
+            collector.cleanup_old_logs()
+
+        mock_scandir.assert_called_once()
+        remaining = sorted(p.name for p in collector.output_dir.iterdir())
+        self.assertEqual(remaining, ["nvidia-bug-report-node-2.log", "nvidia-bug-report-node-2.log.gz", "unrelated.log"])
+
+class TestJSONFormatter(unittest.TestCase):
+    """Test structured log output."""
+
+    def test_format_emits_compact_json_with_extra_fields(self):
+        record = logging.LogRecord('log_collector', logging.ERROR, __file__, 1, 'collection failed', None, None)
+        record.error_code = 'CWA-BR-5007'
+
+        line = log_collector.JSONFormatter().format(record)
+
+        self.assertNotIn(', "', line)
+        self.assertNotIn('": ', line)
+        data = json.loads(line)
+        self.assertEqual(data['level'], 'error')
+        self.assertEqual(data['message'], 'collection failed')
+        self.assertEqual(data['error_code'], 'CWA-BR-5007')
+        self.assertTrue(data['timestamp'].endswith('Z'))
+
+    def test_timestamp_is_utc_with_microseconds(self):
+        record = logging.LogRecord('log_collector', logging.WARNING, __file__, 1, 'msg', None, None)
+        record.created = 1767709822.5
+
+        data = json.loads(log_collector.JSONFormatter().format(record))
+
+        self.assertEqual(data['timestamp'], '2026-01-06T14:30:22.500000Z')
+        self.assertEqual(data['level'], 'warning')
+
+    def test_buffered_handler_flushes_on_warning_or_interval(self):
+        stream = Mock()
+        log_handler = log_collector.BufferedStreamHandler(stream)
+        log_handler.setFormatter(log_collector.JSONFormatter())
+
+        def record(level):
+            return logging.LogRecord('log_collector', level, __file__, 1, 'msg', None, None)
+
+        with patch.object(log_collector.time, 'monotonic', return_value=log_handler._last_flush):
+            log_handler.emit(record(logging.INFO))
+            stream.flush.assert_not_called()
+            log_handler.emit(record(logging.WARNING))
+            stream.flush.assert_called_once()
+
+        with patch.object(log_collector.time, 'monotonic', return_value=log_handler._last_flush + 2):
+            log_handler.emit(record(logging.INFO))
+        self.assertEqual(stream.flush.call_count, 2)
+        self.assertEqual(stream.write.call_count, 3)
+
+
 class TestAPIMode(unittest.TestCase):
     """Test API-driven mode functionality."""
 
     def setUp(self):
         """Set up test fixtures for API tests."""
         self.output_dir = tempfile.mkdtemp()
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['LOG_OUTPUT_DIR'] = self.output_dir
-        os.environ['VM_ID'] = 'test-vm-123'
-        os.environ['API_ENABLED'] = 'true'
-        os.environ['API_BASE_URL'] = 'https://test-api.com'
-
-    def tearDown(self):
-        """Clean up after tests."""
-        for key in ['NODE_NAME', 'LOG_OUTPUT_DIR', 'VM_ID', 'API_ENABLED', 'API_BASE_URL']:
-            if key in os.environ:
-                del os.environ[key]
-
-    @patch('log_collector.requests.get')
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        env = patch.dict(os.environ, {
+            'NODE_NAME': 'test-node',
+            'LOG_OUTPUT_DIR': self.output_dir,
+            'VM_ID': 'test-vm-123',
+            'API_ENABLED': 'true',
+            'API_BASE_URL': 'https://test-api.com',
+        })
+        env.start()
+        self.addCleanup(env.stop)
+
+    @patch('log_collector.requests.Session.get')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_check_for_tasks_success(self, mock_core_api, mock_load_config, mock_get):
@@ -248,7 +437,7 @@ class TestAPIMode(unittest.TestCase):
         self.assertEqual(result['event_id'], 'evt-12345')
         mock_get.assert_called_once()
 
-    @patch('log_collector.requests.get')
+    @patch('log_collector.requests.Session.get')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_check_for_tasks_no_tasks(self, mock_core_api, mock_load_config, mock_get):
@@ -264,7 +453,68 @@ class TestAPIMode(unittest.TestCase):
 
         self.assertIsNone(result)
 
-    @patch('log_collector.requests.post')
+    @patch('log_collector.API_MAX_BACKOFF', 900)
+    @patch('log_collector.API_POLL_INTERVAL', 60)
+    @patch('log_collector.random.uniform', side_effect=lambda low, high: high)
+    @patch('log_collector.requests.Session.get')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_poll_backoff_on_failures(self, mock_core_api, mock_load_config, mock_get, mock_uniform):
+        """Test that failed polls double the poll delay up to the cap and a success resets it."""
+        collector = LogCollector()
+        self.assertEqual(collector._next_poll_delay(), 60)
+
+        failed = Mock()
+        failed.status_code = 503
+        mock_get.return_value = failed
+        delays = []
+        for _ in range(5):
+            collector.check_for_tasks()
+            delays.append(collector._next_poll_delay())
+        self.assertEqual(delays, [120, 240, 480, 900, 900])
+        # Retries are spread between the normal interval and the backoff bound
+        self.assertEqual(mock_uniform.call_args[0], (60, 900))
+
+        mock_get.side_effect = log_collector.requests.exceptions.Timeout()
+        collector.check_for_tasks()
+        self.assertEqual(collector._poll_failures, 6)
+
+        ok = Mock()
+        ok.status_code = 404
+        mock_get.side_effect = None
+        mock_get.return_value = ok
+        collector.check_for_tasks()
+        self.assertEqual(collector._next_poll_delay(), 60)
+
+    @patch('log_collector.API_POLL_INTERVAL', 30)
+    @patch('log_collector.API_LONG_POLL_WAIT', 30)
+    @patch('log_collector.requests.Session.get')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_long_poll_waits_only_for_the_rest_of_the_interval(self, mock_core_api, mock_load_config, mock_get):
+        """Test that long-polls pass the wait and only sleep for whatever is left of the interval."""
+        collector = LogCollector()
+        idle = Mock()
+        idle.status_code = 204
+        mock_get.return_value = idle
+
+        # LOG is disabled so the log handler's flush clock doesn't consume the scripted values
+        with patch.object(log_collector.LOG, 'disabled', True), \
+                patch('log_collector.time.monotonic', side_effect=[1000.0, 1030.0]):
+            self.assertIsNone(collector.check_for_tasks())
+            self.assertEqual(collector._next_poll_delay(), 0.0)
+
+        call_kwargs = mock_get.call_args[1]
+        self.assertEqual(call_kwargs['params']['wait'], 30)
+        self.assertEqual(call_kwargs['timeout'], (log_collector.API_TIMEOUT[0], log_collector.API_TIMEOUT[1] + 30))
+
+        # A server that ignores the wait is still polled only once per interval
+        with patch.object(log_collector.LOG, 'disabled', True), \
+                patch('log_collector.time.monotonic', side_effect=[2000.0, 2001.0]):
+            collector.check_for_tasks()
+            self.assertEqual(collector._next_poll_delay(), 29.0)
+
+    @patch('log_collector.requests.Session.post')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_report_result_success(self, mock_core_api, mock_load_config, mock_post):
@@ -284,12 +534,16 @@ class TestAPIMode(unittest.TestCase):
 
         self.assertTrue(result)
         mock_post.assert_called_once()
-        # Verify it was called with files (multipart)
+        # Verify it was sent as a streamed multipart body
         call_kwargs = mock_post.call_args[1]
-        self.assertIn('files', call_kwargs)
-        self.assertIn('data', call_kwargs)
+        self.assertNotIn('files', call_kwargs)
+        body = call_kwargs['data']
+        self.assertIsInstance(body, log_collector.MultipartEncoder)
+        self.assertEqual(call_kwargs['headers']['Content-Type'], body.content_type)
+        self.assertEqual(body.fields['event_id'], 'evt-123')
+        self.assertEqual(body.fields['file'][0], 'test-log.log.gz')
 
-    @patch('log_collector.requests.post')
+    @patch('log_collector.requests.Session.post')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_report_result_failure(self, mock_core_api, mock_load_config, mock_post):
@@ -310,26 +564,102 @@ class TestAPIMode(unittest.TestCase):
         self.assertIn('json', call_kwargs)
         self.assertNotIn('files', call_kwargs)
 
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_sigterm_stops_api_polling(self, mock_core_api, mock_load_config):
+        """Test that SIGTERM during the wait between polls ends the API loop."""
+        collector = LogCollector()
+        collector.vm_id = 'test-vm-123'
+        collector.check_for_tasks = Mock(return_value=None)
+
+        def wait(timeout):
+            collector.handle_sigterm(log_collector.signal.SIGTERM, None)
+            return True
+
+        with patch.object(collector._shutdown, 'wait', side_effect=wait) as mock_wait:
+            collector._run_api_mode()
+
+        collector.check_for_tasks.assert_called_once()
+        mock_wait.assert_called_once_with(log_collector.API_POLL_INTERVAL)
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_api_mode_reports_collection_exception_as_failure(self, mock_core_api, mock_load_config):
+        """Test that an exception from collect_logs is reported as an internal error, without a worker thread."""
+        collector = LogCollector()
+        collector.vm_id = 'test-vm-123'
+        collector.check_for_tasks = Mock(return_value={'status': 'success', 'event_id': 'evt-1'})
+        collector.collect_logs = Mock(side_effect=RuntimeError('boom'))
+        collector.report_result = Mock(return_value=True)
+
+        class StopLoop(BaseException):
+            pass
+
+        with patch('log_collector.threading.Thread') as mock_thread, \
+                patch.object(collector._shutdown, 'wait', side_effect=StopLoop):
+            with self.assertRaises(StopLoop):
+                collector._run_api_mode()
+
+        mock_thread.assert_not_called()
+        collector.collect_logs.assert_called_once_with('evt-1')
+        collector.report_result.assert_called_once_with(
+            'evt-1', 'failed',
+            error_code=log_collector.BugReportError.INTERNAL_ERROR.code,
+            message=log_collector.BugReportError.INTERNAL_ERROR.message,
+        )
+
+    @patch('log_collector.CRUSOE_AUTH_TOKEN', 'test-token')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_api_calls_share_one_session(self, mock_core_api, mock_load_config):
+        """Test that polls and reports go through one session carrying the auth header."""
+        collector = LogCollector()
+
+        self.assertEqual(collector.http.headers['Authorization'], 'Bearer test-token')
+        adapter = collector.http.get_adapter('https://test-api.com')
+        self.assertEqual(adapter.max_retries.total, 2)
+        socket_options = adapter.poolmanager.connection_pool_kw['socket_options']
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), socket_options)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), socket_options)
+
+        mock_response = Mock()
+        mock_response.status_code = 404
+        with patch.object(collector.http, 'get', return_value=mock_response) as mock_get, \
+                patch.object(collector.http, 'post', return_value=mock_response) as mock_post:
+            collector.check_for_tasks()
+            collector.check_for_tasks()
+            collector.report_result('evt-123', 'failed', message='boom')
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args[1]['timeout'], log_collector.API_TIMEOUT)
+        mock_post.assert_called_once()
+
+    @patch('log_collector.API_BASE_URL', 'http://test-api.invalid')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_poll_read_timeout_is_not_retried(self, mock_core_api, mock_load_config):
+        """A read timeout on the poll goes back to the poll loop instead of being retried."""
+        collector = LogCollector()
+        pool = urllib3.connectionpool.HTTPConnectionPool('test-api.invalid')
+        read_timeout = urllib3.exceptions.ReadTimeoutError(pool, '/agent/check-tasks', 'Read timed out.')
+
+        with patch('urllib3.connectionpool.HTTPConnectionPool._make_request',
+                   side_effect=read_timeout) as mock_request, \
+                patch('log_collector._get_proxies', return_value={}):
+            self.assertIsNone(collector.check_for_tasks())
+
+        mock_request.assert_called_once()
+        self.assertEqual(collector._poll_failures, 1)
+
 
 class TestEnvironmentVariables(unittest.TestCase):
     """Test environment variable handling."""
 
     def setUp(self):
-        """Store original environment variables."""
-        self.original_node_name = os.environ.get('NODE_NAME')
-        self.original_namespace = os.environ.get('DRIVER_NAMESPACE')
-
-    def tearDown(self):
-        """Restore original environment variables."""
-        if self.original_node_name:
-            os.environ['NODE_NAME'] = self.original_node_name
-        elif 'NODE_NAME' in os.environ:
-            del os.environ['NODE_NAME']
-
-        if self.original_namespace:
-            os.environ['DRIVER_NAMESPACE'] = self.original_namespace
-        elif 'DRIVER_NAMESPACE' in os.environ:
-            del os.environ['DRIVER_NAMESPACE']
+        """Restore the environment after each test."""
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
 
     def test_missing_node_name(self):
         """Test that missing NODE_NAME raises error in K8s mode."""
@@ -366,15 +696,10 @@ class TestCollectionWorkflow(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
         self.output_dir = tempfile.mkdtemp()
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['LOG_OUTPUT_DIR'] = self.output_dir
-
-    def tearDown(self):
-        """Clean up test environment."""
-        if 'NODE_NAME' in os.environ:
-            del os.environ['NODE_NAME']
-        if 'LOG_OUTPUT_DIR' in os.environ:
-            del os.environ['LOG_OUTPUT_DIR']
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node', 'LOG_OUTPUT_DIR': self.output_dir})
+        env.start()
+        self.addCleanup(env.stop)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -390,16 +715,10 @@ class TestCollectionWorkflow(unittest.TestCase):
         mock_pod.metadata.name = 'nvidia-gpu-driver-test'
         collector.find_nvidia_driver_pod = Mock(return_value=mock_pod)
 
-        # Mock execute nvidia-bug-report
-        collector.execute_nvidia_bug_report = Mock(return_value=('/tmp/test-log.log.gz', None, None))
-
-        # Mock download
+        # Mock generating and downloading nvidia-bug-report
         test_log = Path(self.output_dir) / 'test-log.log.gz'
         test_log.write_text('test')
-        collector.download_log_file = Mock(return_value=(test_log, None, None))
-
-        # Mock cleanup
-        collector.cleanup_remote_log = Mock(return_value=True)
+        collector.run_and_fetch = Mock(return_value=(test_log, None, None))
         collector.cleanup_old_logs = Mock()
 
         log_path, error_code, error_msg = collector.collect_logs()
@@ -408,9 +727,35 @@ class TestCollectionWorkflow(unittest.TestCase):
         self.assertEqual(log_path, test_log)
         self.assertIsNone(error_code)
         self.assertIsNone(error_msg)
-        # Verify execute was called with event_id=None
-        collector.execute_nvidia_bug_report.assert_called_once_with(mock_pod, None)
-        collector.cleanup_remote_log.assert_called_once_with(mock_pod, '/tmp/test-log.log.gz')
+        # Verify the bug report was collected with event_id=None
+        collector.run_and_fetch.assert_called_once_with(mock_pod, None, deadline=ANY)
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_collect_logs_deduplicates_identical_scheduled_reports(self, mock_core_api, mock_load_config):
+        """Test that an identical scheduled report is replaced by a .dup marker."""
+        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
+            collector = LogCollector()
+
+        first = Path(self.output_dir) / 'nvidia-bug-report-1.log.gz'
+        second = Path(self.output_dir) / 'nvidia-bug-report-2.log.gz'
+        first.write_bytes(b'same report')
+        second.write_bytes(b'same report')
+
+        collector._is_bundled_driver_mode = Mock(return_value=True)
+        collector.execute_bug_report_local = Mock(side_effect=[(first, None, None), (second, None, None)])
+        collector.cleanup_old_logs = Mock()
+
+        with patch.object(log_collector, 'DEDUPLICATE_REPORTS', True):
+            self.assertEqual(collector.collect_logs()[0], first)
+            log_path, error_code, error_msg = collector.collect_logs()
+
+        self.assertEqual(log_path, first)
+        self.assertIsNone(error_code)
+        self.assertTrue(first.exists())
+        self.assertFalse(second.exists())
+        marker = Path(self.output_dir) / 'nvidia-bug-report-2.log.gz.dup'
+        self.assertEqual(marker.read_text().strip(), first.name)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -426,27 +771,22 @@ class TestCollectionWorkflow(unittest.TestCase):
         mock_pod.metadata.name = 'nvidia-gpu-driver-test'
         collector.find_nvidia_driver_pod = Mock(return_value=mock_pod)
 
-        # Mock execute nvidia-bug-report
-        collector.execute_nvidia_bug_report = Mock(return_value=('/tmp/test-log-evt123.log.gz', None, None))
-
-        # Mock download
+        # Mock generating and downloading nvidia-bug-report
         test_log = Path(self.output_dir) / 'test-log-evt123.log.gz'
         test_log.write_text('test')
-        collector.download_log_file = Mock(return_value=(test_log, None, None))
-
-        # Mock cleanup
-        collector.cleanup_remote_log = Mock(return_value=True)
+        collector.run_and_fetch = Mock(return_value=(test_log, None, None))
         collector.cleanup_old_logs = Mock()
 
-        log_path, error_code, error_msg = collector.collect_logs(event_id='evt-123')
+        with patch.object(log_collector.time, 'monotonic', return_value=1000.0):
+            log_path, error_code, error_msg = collector.collect_logs(event_id='evt-123')
 
         self.assertIsNotNone(log_path)
         self.assertEqual(log_path, test_log)
         self.assertIsNone(error_code)
         self.assertIsNone(error_msg)
-        # Verify execute was called with event_id
-        collector.execute_nvidia_bug_report.assert_called_once_with(mock_pod, 'evt-123')
-        collector.cleanup_remote_log.assert_called_once_with(mock_pod, '/tmp/test-log-evt123.log.gz')
+        # Verify the bug report was collected with event_id, under the collection's deadline
+        collector.run_and_fetch.assert_called_once_with(
+            mock_pod, 'evt-123', deadline=1000.0 + log_collector.COLLECTION_TIMEOUT)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -473,7 +813,7 @@ class TestCollectionWorkflow(unittest.TestCase):
         mock_pod = Mock()
         mock_pod.metadata.name = 'nvidia-gpu-driver-test'
         collector.find_nvidia_driver_pod = Mock(return_value=mock_pod)
-        collector.execute_nvidia_bug_report = Mock(return_value=(None, 'CWA-BR-5005', 'Error executing bug report script'))
+        collector.run_and_fetch = Mock(return_value=(None, 'CWA-BR-5005', 'Error executing bug report script'))
         collector.cleanup_old_logs = Mock()
 
         log_path, error_code, error_msg = collector.collect_logs()
@@ -492,9 +832,7 @@ class TestCollectionWorkflow(unittest.TestCase):
         mock_pod = Mock()
         mock_pod.metadata.name = 'nvidia-gpu-driver-test'
         collector.find_nvidia_driver_pod = Mock(return_value=mock_pod)
-        collector.execute_nvidia_bug_report = Mock(return_value=('/tmp/test-log.log.gz', None, None))
-        collector.download_log_file = Mock(return_value=(None, 'CWA-BR-5007', 'Unexpected error downloading bug report'))
-        collector.cleanup_remote_log = Mock(return_value=True)
+        collector.run_and_fetch = Mock(return_value=(None, 'CWA-BR-5007', 'Unexpected error downloading bug report'))
         collector.cleanup_old_logs = Mock()
 
         log_path, error_code, error_msg = collector.collect_logs()
@@ -502,15 +840,107 @@ class TestCollectionWorkflow(unittest.TestCase):
         self.assertIsNone(log_path)
         self.assertEqual(error_code, 'CWA-BR-5007')
         self.assertIn("Unexpected error downloading bug report", error_msg)
-        collector.cleanup_remote_log.assert_called_once_with(mock_pod, '/tmp/test-log.log.gz')
+
+
+class TestScheduledMode(unittest.TestCase):
+    """Test the scheduled collection loop."""
+
+    def setUp(self):
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node'})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _run_cycles(self, collector, monotonic_values, cycles):
+        sleeps = []
+
+        def fake_wait(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == cycles:
+                collector._shutdown.set()
+            return collector._shutdown.is_set()
+
+        collector._shutdown.wait = fake_wait
+        # Logging is kept off the patched clock so the handler doesn't consume the scripted values
+        with patch.object(log_collector, 'COLLECTION_INTERVAL', 100), \
+                patch.object(log_collector.LOG, 'disabled', True), \
+                patch.object(log_collector.handler, 'flush'), \
+                patch.object(log_collector.time, 'monotonic', side_effect=monotonic_values):
+            collector._run_scheduled_mode()
+        return sleeps
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_scheduled_mode_sleeps_to_absolute_deadline(self, mock_core_api, mock_load_config):
+        """Test that collection time is subtracted from the sleep, so cycles don't drift."""
+        collector = LogCollector()
+        collector.collect_logs = Mock(return_value=(Path('/logs/report.log.gz'), None, None))
+
+        # start at 0; first cycle takes 30s, second (starting at 100) takes 45s
+        sleeps = self._run_cycles(collector, [0.0, 30.0, 145.0], cycles=2)
+
+        self.assertEqual(sleeps, [70.0, 55.0])
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_scheduled_mode_skips_overrun_cycles(self, mock_core_api, mock_load_config):
+        """Test that an overrunning collection waits for the next boundary instead of queueing."""
+        collector = LogCollector()
+        collector.collect_logs = Mock(return_value=(Path('/logs/report.log.gz'), None, None))
+
+        # Collection takes 250s: the boundaries at 100 and 200 are skipped, next run at 300
+        sleeps = self._run_cycles(collector, [0.0, 250.0], cycles=1)
+
+        self.assertEqual(sleeps, [50.0])
+
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_sigterm_stops_scheduled_loop(self, mock_core_api, mock_load_config):
+        """Test that SIGTERM ends the loop after the current cycle instead of sleeping."""
+        collector = LogCollector()
+
+        def collect():
+            collector.handle_sigterm(None, None)
+            return None, None, None
+
+        collector.collect_logs = Mock(side_effect=collect)
+
+        collector._run_scheduled_mode()
+
+        collector.collect_logs.assert_called_once()
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_shutdown_skips_starting_a_new_bug_report(self, mock_core_api, mock_load_config):
+        """Test that no bug report is started in the driver pod once shutdown is requested."""
+        collector = LogCollector()
+        collector._is_bundled_driver_mode = Mock(return_value=False)
+        collector.find_nvidia_driver_pod = Mock(return_value=Mock())
+        collector.cleanup_old_logs = Mock()
+        collector.run_and_fetch = Mock()
+
+        collector.handle_sigterm(None, None)
+        log_path, error_code, error_msg = collector.collect_logs()
+
+        self.assertIsNone(log_path)
+        self.assertEqual(error_code, 'CWA-BR-5010')
+        collector.run_and_fetch.assert_not_called()
 
 
 class FakeExecResponse:
-    def __init__(self, stdout='', stderr=''):
+    def __init__(self, stdout='', stderr='', returncode=0):
         self.stdout = stdout
         self.stderr = stderr
+        self._returncode = returncode
         self.open = True
 
+    @property
+    def returncode(self):
+        if self._returncode is None:
+            # What WSClient raises when no status arrived on the error channel
+            raise TypeError("'NoneType' object is not subscriptable")
+        return self._returncode
+
     def is_open(self):
         return self.open
 
@@ -538,9 +968,10 @@ class FakeExecResponse:
 
 
 class ChunkedFakeExecResponse:
-    def __init__(self, stdout_chunks=None, stderr_chunks=None):
+    def __init__(self, stdout_chunks=None, stderr_chunks=None, returncode=0):
         self.stdout_chunks = list(stdout_chunks or [])
         self.stderr_chunks = list(stderr_chunks or [])
+        self.returncode = returncode
         self.current_stdout = ''
         self.current_stderr = ''
         self.open = True
@@ -603,17 +1034,13 @@ class HangingFakeExecResponse:
         self.closed = True
 
 
-class TestDownloadLogFile(unittest.TestCase):
+class TestRunAndFetch(unittest.TestCase):
     def setUp(self):
         self.output_dir = tempfile.mkdtemp()
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['LOG_OUTPUT_DIR'] = self.output_dir
-
-    def tearDown(self):
-        if 'NODE_NAME' in os.environ:
-            del os.environ['NODE_NAME']
-        if 'LOG_OUTPUT_DIR' in os.environ:
-            del os.environ['LOG_OUTPUT_DIR']
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node', 'LOG_OUTPUT_DIR': self.output_dir})
+        env.start()
+        self.addCleanup(env.stop)
 
     def _make_pod(self):
         mock_pod = Mock()
@@ -623,254 +1050,403 @@ class TestDownloadLogFile(unittest.TestCase):
         mock_pod.spec.containers = [mock_container]
         return mock_pod
 
-    def _make_encoded_tar(self, remote_file, file_data):
-        tar_buffer = io.BytesIO()
-        with tarfile.open(fileobj=tar_buffer, mode='w') as tar:
-            tar_info = tarfile.TarInfo(remote_file)
-            tar_info.size = len(file_data)
-            tar.addfile(tar_info, io.BytesIO(file_data))
-
-        return base64.b64encode(tar_buffer.getvalue()).decode()
+    def _make_collector(self):
+        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
+            return LogCollector()
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_ignores_stderr_when_decoding_base64(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        remote_file = 'nvidia-bug-report-test-node.log.gz'
+    def test_run_and_fetch_writes_stdout_to_report(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
         file_data = b'test log data'
-        encoded_tar = self._make_encoded_tar(remote_file, file_data)
-        mock_pod = self._make_pod()
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            FakeExecResponse(stdout=encoded_tar, stderr='tar: removing leading / from member names\n')
-        ]
+        mock_stream.return_value = FakeExecResponse(stdout=file_data, stderr='nvidia-bug-report.sh: progress\n')
 
-        log_path, error_code, error_msg = collector.download_log_file(mock_pod, f'/tmp/{remote_file}')
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod(), 'evt-123')
 
-        self.assertEqual(log_path, Path(self.output_dir) / remote_file)
         self.assertIsNone(error_code)
         self.assertIsNone(error_msg)
+        self.assertEqual(log_path.parent, Path(self.output_dir))
+        self.assertRegex(log_path.name, r'^nvidia-bug-report-test-node-evt-123-\d{8}T\d{6}Z\.log\.gz$')
         self.assertEqual(log_path.read_bytes(), file_data)
+        self.assertEqual(os.listdir(self.output_dir), [log_path.name])
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_reassembles_multichunk_stdout(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        remote_file = 'nvidia-bug-report-test-node.log.gz'
-        file_data = b'test log data' * 1024
-        encoded_tar = self._make_encoded_tar(remote_file, file_data)
-        chunks = [encoded_tar[i:i + 97] for i in range(0, len(encoded_tar), 97)]
-
-        mock_stream.side_effect = [
-            'EXISTS',
-            ChunkedFakeExecResponse(stdout_chunks=chunks)
-        ]
+    def test_run_and_fetch_uses_single_binary_exec(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+
+        mock_stream.return_value = FakeExecResponse(stdout=b'test log data')
+
+        collector.run_and_fetch(self._make_pod())
+
+        # Generate, download and remove the report in one exec
+        mock_stream.assert_called_once()
+        kwargs = mock_stream.call_args[1]
+        self.assertEqual(kwargs['_preload_content'], False)
+        self.assertTrue(kwargs['binary'])
+        script = kwargs['command'][2]
+        self.assertIn("trap 'rm -f", script)
+        self.assertIn('nvidia-bug-report.sh --output-file', script)
+        self.assertIn('cat /tmp/nvidia-bug-report-test-node-', script)
+        # An uncompressed report is gzipped in the pod before transfer
+        self.assertIn('gzip -c /tmp/nvidia-bug-report-test-node-', script)
+
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), 'posix_fadvise not available')
+    @patch('log_collector.stream')
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_run_and_fetch_drops_report_from_page_cache(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+        mock_stream.return_value = FakeExecResponse(stdout=b'test log data')
 
-        log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), f'/tmp/{remote_file}')
+        with patch.object(log_collector.os, 'posix_fadvise') as mock_fadvise:
+            log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertEqual(log_path, Path(self.output_dir) / remote_file)
         self.assertIsNone(error_code)
-        self.assertIsNone(error_msg)
-        self.assertEqual(log_path.read_bytes(), file_data)
+        mock_fadvise.assert_called_once()
+        self.assertEqual(mock_fadvise.call_args[0][1:], (0, 0, os.POSIX_FADV_DONTNEED))
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_uses_preload_content_false_for_download(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        remote_file = 'nvidia-bug-report-test-node.log.gz'
-        encoded_tar = self._make_encoded_tar(remote_file, b'test log data')
+    def test_run_and_fetch_reassembles_multichunk_stdout(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+        file_data = b'test log data' * 1024
+        chunks = [file_data[i:i + 97] for i in range(0, len(file_data), 97)]
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            FakeExecResponse(stdout=encoded_tar)
-        ]
+        mock_stream.return_value = ChunkedFakeExecResponse(stdout_chunks=chunks)
 
-        collector.download_log_file(self._make_pod(), f'/tmp/{remote_file}')
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertEqual(mock_stream.call_args_list[1][1]['_preload_content'], False)
+        self.assertIsNone(error_code)
+        self.assertEqual(log_path.read_bytes(), file_data)
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_handles_empty_poll_without_stopping(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        remote_file = 'nvidia-bug-report-test-node.log.gz'
+    def test_run_and_fetch_handles_empty_poll_without_stopping(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
         file_data = b'test log data after empty poll'
-        encoded_tar = self._make_encoded_tar(remote_file, file_data)
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            ChunkedFakeExecResponse(stdout_chunks=['', encoded_tar[:50], encoded_tar[50:]])
-        ]
+        mock_stream.return_value = ChunkedFakeExecResponse(stdout_chunks=[b'', file_data[:10], file_data[10:]])
 
-        log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), f'/tmp/{remote_file}')
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertEqual(log_path, Path(self.output_dir) / remote_file)
         self.assertIsNone(error_code)
-        self.assertIsNone(error_msg)
         self.assertEqual(log_path.read_bytes(), file_data)
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_interleaved_stderr_does_not_corrupt_base64(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        remote_file = 'nvidia-bug-report-test-node.log.gz'
+    def test_run_and_fetch_interleaved_stderr_does_not_corrupt_file(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
         file_data = b'test log data with stderr'
-        encoded_tar = self._make_encoded_tar(remote_file, file_data)
-        stdout_chunks = [encoded_tar[:50], encoded_tar[50:]]
-        stderr_chunks = ['tar warning\n', 'tar more warning\n']
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            ChunkedFakeExecResponse(stdout_chunks=stdout_chunks, stderr_chunks=stderr_chunks)
-        ]
+        mock_stream.return_value = ChunkedFakeExecResponse(
+            stdout_chunks=[file_data[:10], file_data[10:]],
+            stderr_chunks=['progress\n', 'more progress\n']
+        )
 
-        log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), f'/tmp/{remote_file}')
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertEqual(log_path, Path(self.output_dir) / remote_file)
         self.assertIsNone(error_code)
-        self.assertIsNone(error_msg)
         self.assertEqual(log_path.read_bytes(), file_data)
 
+    @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_read_exec_stream_collects_stdout_and_stderr_chunks(self, mock_core_api, mock_load_config):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
+    def test_run_and_fetch_maps_exit_codes_to_errors(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
 
-        resp = ChunkedFakeExecResponse(
-            stdout_chunks=['out1', '', 'out2'],
-            stderr_chunks=['err1', 'err2']
-        )
+        for returncode, expected_code in ((127, 'CWA-BR-5001'), (3, 'CWA-BR-5003'), (4, 'CWA-BR-5006'), (1, 'CWA-BR-5007')):
+            with self.subTest(returncode=returncode):
+                mock_stream.return_value = FakeExecResponse(stdout=b'partial', stderr='failed\n', returncode=returncode)
 
-        stdout_output, stderr_output = collector._read_exec_stream(resp)
+                log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertEqual(stdout_output, 'out1out2')
-        self.assertEqual(stderr_output, 'err1err2')
+                self.assertIsNone(log_path)
+                self.assertEqual(error_code, expected_code)
+                self.assertEqual(os.listdir(self.output_dir), [])
 
+    @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_read_exec_stream_times_out_on_hung_exec(self, mock_core_api, mock_load_config):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
+    def test_run_and_fetch_stream_without_exit_status_leaves_no_partial_file(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
 
-        resp = HangingFakeExecResponse()
+        # The websocket dropped mid-download, so no status arrived on the error channel
+        mock_stream.return_value = FakeExecResponse(stdout=b'test log data', returncode=None)
 
-        # Patch monotonic so the deadline (first call) is immediately exceeded by the
-        # loop's checks. chain+repeat keeps the fake stable no matter how many times
-        # monotonic() is called, so adding e.g. elapsed-time logging later won't break it.
-        monotonic_values = itertools.chain([1000.0], itertools.repeat(1100.0))
-        with patch.object(log_collector.time, 'monotonic', side_effect=monotonic_values):
-            with self.assertRaises(TimeoutError):
-                collector._read_exec_stream(resp, timeout=5)
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        # The hung stream must be closed so the websocket/thread can be released.
-        self.assertTrue(resp.closed)
+        self.assertIsNone(log_path)
+        self.assertEqual(error_code, 'CWA-BR-5007')
+        self.assertIn("Unexpected error downloading bug report", error_msg)
+        self.assertEqual(os.listdir(self.output_dir), [])
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_timeout_returns_timed_out_code(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
+    def test_run_and_fetch_timeout_returns_timed_out_code(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
 
-        # File-exists check succeeds, then the download read hangs.
-        mock_stream.side_effect = [
-            'EXISTS',
-            HangingFakeExecResponse()
-        ]
+        mock_stream.return_value = HangingFakeExecResponse()
 
-        # Drive monotonic past the deadline so _read_exec_stream raises TimeoutError.
+        # Drive monotonic past the deadline so the stream reader raises TimeoutError.
         monotonic_values = itertools.chain([1000.0], itertools.repeat(1000.0 + log_collector.COLLECTION_TIMEOUT + 1))
         with patch.object(log_collector.time, 'monotonic', side_effect=monotonic_values):
-            log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), '/tmp/test.log.gz')
+            log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
         # A hung exec must surface as a timeout, not a generic internal error.
         self.assertIsNone(log_path)
         self.assertEqual(error_code, 'CWA-BR-5008')
+        self.assertEqual(os.listdir(self.output_dir), [])
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_reports_invalid_base64_stdout(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
-
-        mock_pod = Mock()
-        mock_pod.metadata.name = 'nvidia-gpu-driver-test'
-        mock_container = Mock()
-        mock_container.name = 'nvidia-driver-ctr'
-        mock_pod.spec.containers = [mock_container]
-
-        mock_stream.side_effect = [
-            'EXISTS',
-            FakeExecResponse(stdout='not base64!', stderr='tar failed\n')
-        ]
+    def test_run_and_fetch_sigterm_interrupts_blocked_exec(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+        resp = HangingFakeExecResponse()
+        # SIGTERM arrives while the reader is blocked waiting on the websocket
+        resp.update = Mock(side_effect=lambda timeout=1: collector.handle_sigterm(15, None))
+        mock_stream.return_value = resp
 
-        log_path, error_code, error_msg = collector.download_log_file(mock_pod, '/tmp/test.log.gz')
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
         self.assertIsNone(log_path)
-        self.assertEqual(error_code, 'CWA-BR-5007')
-        self.assertIn("Unexpected error downloading bug report", error_msg)
+        self.assertEqual(error_code, 'CWA-BR-5010')
+        resp.update.assert_called_once()
+        self.assertTrue(resp.closed)
+        self.assertEqual(os.listdir(self.output_dir), [])
+        # Outside the blocking read, SIGTERM only sets the shutdown flag again
+        self.assertFalse(collector._interrupt_on_sigterm)
+        collector.handle_sigterm(15, None)
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_empty_stdout_returns_error(self, mock_core_api, mock_load_config, mock_stream):
-        with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
-            collector = LogCollector()
+    def test_run_and_fetch_sigterm_outside_blocking_read_does_not_raise(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+        mock_stream.return_value = FakeExecResponse(stdout=b'test log data')
+        real_write_all = log_collector._write_all
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            FakeExecResponse(stdout='', stderr='tar: produced no output\n')
-        ]
+        def write_then_sigterm(fd, chunk):
+            # SIGTERM lands while writing to disk, outside the websocket wait
+            collector.handle_sigterm(15, None)
+            real_write_all(fd, chunk)
 
-        log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), '/tmp/test.log.gz')
+        with patch('log_collector._write_all', side_effect=write_then_sigterm) as mock_write:
+            log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
 
-        self.assertIsNone(log_path)
-        self.assertEqual(error_code, 'CWA-BR-5007')
-        self.assertIn("Unexpected error downloading bug report", error_msg)
+        # The stream had already finished, so the report is kept
+        mock_write.assert_called_once()
+        self.assertIsNone(error_code)
+        self.assertEqual(log_path.read_bytes(), b'test log data')
+        self.assertTrue(collector._shutdown.is_set())
+        self.assertFalse(collector._interrupt_on_sigterm)
 
     @patch('log_collector.stream')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
-    def test_download_log_file_non_tar_payload_returns_error(self, mock_core_api, mock_load_config, mock_stream):
-        # Valid base64 that decodes to non-tar bytes: mirrors a clean-boundary truncation
-        non_tar = base64.b64encode(b'valid base64 but not a tar archive').decode()
+    def test_run_and_fetch_skips_exec_after_sigterm(self, mock_core_api, mock_load_config, mock_stream):
+        collector = self._make_collector()
+        collector.handle_sigterm(15, None)
+
+        log_path, error_code, error_msg = collector.run_and_fetch(self._make_pod())
+
+        self.assertIsNone(log_path)
+        self.assertEqual(error_code, 'CWA-BR-5010')
+        mock_stream.assert_not_called()
+
+
+class TestExecStreamReader(unittest.TestCase):
+    def _drain(self, reader):
+        chunks = []
+        while (chunk := reader.read_chunk()) is not None:
+            chunks.append(chunk)
+        return chunks
+
+    def test_collects_stdout_and_stderr_chunks(self):
+        resp = ChunkedFakeExecResponse(
+            stdout_chunks=['out1', '', 'out2'],
+            stderr_chunks=['err1', 'err2']
+        )
+        reader = log_collector._ExecStreamReader(resp)
+
+        self.assertEqual(self._drain(reader), ['out1', 'out2'])
+        self.assertEqual(reader.stderr, 'err1err2')
+
+    def test_blocks_for_remaining_budget(self):
+        resp = ChunkedFakeExecResponse(stdout_chunks=['out'])
+        timeouts = []
+        original_update = resp.update
+
+        def recording_update(timeout=1):
+            timeouts.append(timeout)
+            original_update(timeout=timeout)
+
+        resp.update = recording_update
+
+        # Waits are bounded by the overall deadline, not sliced into 1s polls.
+        with patch.object(log_collector.time, 'monotonic', return_value=1000.0):
+            self._drain(log_collector._ExecStreamReader(resp, timeout=30))
+
+        self.assertTrue(timeouts)
+        self.assertTrue(all(t == 30 for t in timeouts))
+
+    def test_times_out_on_hung_exec(self):
+        resp = HangingFakeExecResponse()
+
+        # Patch monotonic so the deadline (first call) is immediately exceeded by the
+        # loop's checks. chain+repeat keeps the fake stable no matter how many times
+        # monotonic() is called, so adding e.g. elapsed-time logging later won't break it.
+        monotonic_values = itertools.chain([1000.0], itertools.repeat(1100.0))
+        with patch.object(log_collector.time, 'monotonic', side_effect=monotonic_values):
+            reader = log_collector._ExecStreamReader(resp, timeout=5)
+            with self.assertRaises(TimeoutError):
+                self._drain(reader)
+
+
+class TestWriteAll(unittest.TestCase):
+    def test_write_all_retries_partial_writes(self):
+        real_write = os.write
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.unlink, path)
+
+        # Kernel accepts at most 3 bytes per call
+        with patch.object(log_collector.os, 'write', side_effect=lambda f, data: real_write(f, data[:3])):
+            log_collector._write_all(fd, b'0123456789')
+        os.close(fd)
+
+        self.assertEqual(Path(path).read_bytes(), b'0123456789')
+
+
+class TestRunLocalScript(unittest.TestCase):
+    """Test running local bug report scripts under timeout and shutdown."""
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def setUp(self, mock_core_api, mock_load_config):
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.collector = LogCollector()
+
+    def test_returns_completed_process(self):
+        result = self.collector._run_local_script(
+            ['/bin/sh', '-c', 'echo out; echo err >&2; exit 3'],
+            stdout=log_collector.subprocess.PIPE, stderr=log_collector.subprocess.PIPE, text=True)
+
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stdout, 'out\n')
+        self.assertEqual(result.stderr, 'err\n')
+
+    def test_flushes_buffered_logs_before_script_runs(self):
+        with patch.object(log_collector.handler, 'flush') as mock_flush, \
+                patch.object(log_collector.subprocess, 'Popen', side_effect=OSError("no script")):
+            with self.assertRaises(OSError):
+                self.collector._run_local_script(['/nonexistent/bug-report.sh'])
+
+        # The "Running command" line is out before the script can block for minutes
+        mock_flush.assert_called_once()
+
+    def test_shutdown_stops_running_script(self):
+        self.collector._shutdown.set()
+
+        with self.assertRaises(log_collector._ShutdownRequested):
+            self.collector._run_local_script(['sleep', '30'])
 
+    def test_timeout_kills_script(self):
+        with patch.object(log_collector, 'COLLECTION_TIMEOUT', 0):
+            with self.assertRaises(log_collector.subprocess.TimeoutExpired):
+                self.collector._run_local_script(['sleep', '30'])
+
+    def test_timeout_reports_budget_from_deadline(self):
+        deadline = log_collector.time.monotonic() + 1
+        with self.assertRaises(log_collector.subprocess.TimeoutExpired) as cm:
+            self.collector._run_local_script(['sleep', '30'], deadline=deadline)
+
+        # The script's own budget, not the full COLLECTION_TIMEOUT
+        self.assertGreater(cm.exception.timeout, 0)
+        self.assertLessEqual(cm.exception.timeout, 1)
+
+
+class TestAmdLocalReport(unittest.TestCase):
+    """Test the AMD rocm_techsupport.sh path of execute_bug_report_local."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node'})
+        env.start()
+        self.addCleanup(env.stop)
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_keeps_uncompressed_report_when_compression_times_out(self, mock_core_api, mock_load_config):
         with patch.object(log_collector, 'LOG_OUTPUT_DIR', self.output_dir):
             collector = LogCollector()
+        collector.gpu_type = 'amd'
+        collector._run_local_script = Mock(side_effect=lambda cmd, stdout, **kwargs: stdout.write(b'report'))
 
-        mock_stream.side_effect = [
-            'EXISTS',
-            FakeExecResponse(stdout=non_tar)
-        ]
+        with patch.object(log_collector.Path, 'exists', return_value=True), \
+                patch('log_collector._gzip_report', side_effect=TimeoutError("gzip did not finish")):
+            log_path, error_code, error_msg = collector.execute_bug_report_local('evt-1')
 
-        log_path, error_code, error_msg = collector.download_log_file(self._make_pod(), '/tmp/test.log.gz')
+        self.assertIsNone(error_code)
+        self.assertEqual(log_path.suffix, '.log')
+        self.assertEqual(log_path.read_bytes(), b'report')
 
-        self.assertIsNone(log_path)
-        self.assertEqual(error_code, 'CWA-BR-5007')
-        self.assertIn("Unexpected error downloading bug report", error_msg)
+
+class TestGzipReport(unittest.TestCase):
+    """Test compression of locally generated reports."""
+
+    def setUp(self):
+        report_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, report_dir, ignore_errors=True)
+        self.report = Path(report_dir) / "amd-bug-report-node.log"
+        self.report.write_bytes(b"report line\n" * 1000)
+
+    def test_falls_back_to_gzip_module_without_pigz(self):
+        with patch('log_collector.shutil.which', return_value=None):
+            gz_path = log_collector._gzip_report(self.report, log_collector.time.monotonic() + 60)
+
+        self.assertEqual(gz_path.name, "amd-bug-report-node.log.gz")
+        self.assertFalse(self.report.exists())
+        with gzip.open(gz_path, "rb") as f:
+            self.assertEqual(f.read(), b"report line\n" * 1000)
+
+    @patch('log_collector.subprocess.run')
+    def test_uses_pigz_on_all_cpus_when_installed(self, mock_run):
+        with patch('log_collector.shutil.which', return_value='/usr/bin/pigz'), \
+                patch('log_collector.os.cpu_count', return_value=8):
+            gz_path = log_collector._gzip_report(self.report, log_collector.time.monotonic() + 60)
+
+        self.assertEqual(gz_path, self.report.with_name("amd-bug-report-node.log.gz"))
+        self.assertEqual(mock_run.call_args[0][0], ['/usr/bin/pigz', '-f', '-p', '8', str(self.report)])
+
+    def test_gzip_fallback_stops_at_deadline(self):
+        with patch('log_collector.shutil.which', return_value=None):
+            with self.assertRaises(TimeoutError):
+                log_collector._gzip_report(self.report, log_collector.time.monotonic() - 1)
+
+        # The partial archive is removed and the original report is left alone
+        self.assertTrue(self.report.exists())
+        self.assertFalse(self.report.with_name("amd-bug-report-node.log.gz").exists())
 
 
 class TestProxyConfig(unittest.TestCase):
     """Test proxy URL resolution."""
 
+    def setUp(self):
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node', 'VM_ID': 'test-vm-123'})
+        env.start()
+        self.addCleanup(env.stop)
+
     def test_get_proxies_enabled(self):
         """When PROXY_ENABLED is true, _get_proxies returns both http and https proxy entries."""
         with patch.object(log_collector, 'PROXY_ENABLED', True):
@@ -890,13 +1466,11 @@ class TestProxyConfig(unittest.TestCase):
             with patch.object(log_collector, 'PROXY_URL', ''):
                 self.assertIsNone(log_collector._get_proxies())
 
-    @patch('log_collector.requests.get')
+    @patch('log_collector.requests.Session.get')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_check_for_tasks_uses_proxy_kwarg(self, mock_core_api, mock_load_config, mock_get):
         """check_for_tasks passes the proxy via the proxies kwarg, not as the base URL."""
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['VM_ID'] = 'test-vm-123'
         collector = LogCollector()
 
         mock_response = Mock()
@@ -914,13 +1488,11 @@ class TestProxyConfig(unittest.TestCase):
         expected_proxies = {'http': 'http://proxy.internal:3128', 'https': 'http://proxy.internal:3128'}
         self.assertEqual(call_args[1].get('proxies'), expected_proxies)
 
-    @patch('log_collector.requests.post')
+    @patch('log_collector.requests.Session.post')
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
     def test_report_result_uses_proxy_kwarg(self, mock_core_api, mock_load_config, mock_post):
         """report_result passes the proxy via the proxies kwarg, not as the base URL."""
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['VM_ID'] = 'test-vm-123'
         collector = LogCollector()
 
         mock_response = Mock()
@@ -943,8 +1515,11 @@ class TestBundledDriverMode(unittest.TestCase):
     """Test _is_bundled_driver_mode instance-type selection."""
 
     def setUp(self):
-        os.environ['NODE_NAME'] = 'test-node'
-        os.environ['LOG_OUTPUT_DIR'] = tempfile.mkdtemp()
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        env = patch.dict(os.environ, {'NODE_NAME': 'test-node', 'LOG_OUTPUT_DIR': output_dir})
+        env.start()
+        self.addCleanup(env.stop)
 
     @patch('log_collector.config.load_incluster_config')
     @patch('log_collector.client.CoreV1Api')
@@ -969,6 +1544,33 @@ class TestBundledDriverMode(unittest.TestCase):
         collector = self._collector_with_instance_type(None)
         self.assertFalse(collector._is_bundled_driver_mode())
 
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_instance_type_is_read_once(self, mock_core_api, mock_load_config):
+        collector = LogCollector()
+        node = Mock()
+        node.metadata.labels = {'node.kubernetes.io/instance-type': 'gb200-4x-nvl.8x'}
+        collector.k8s_api.read_node = Mock(side_effect=[log_collector.ApiException(status=500), node])
+
+        # A failed read is not cached
+        self.assertIsNone(collector._get_node_instance_type())
+        self.assertTrue(collector._is_bundled_driver_mode())
+        self.assertTrue(collector._is_bundled_driver_mode())
+        self.assertEqual(collector.k8s_api.read_node.call_count, 2)
+
+    @patch('log_collector.config.load_incluster_config')
+    @patch('log_collector.client.CoreV1Api')
+    def test_driver_mode_is_decided_once(self, mock_core_api, mock_load_config):
+        collector = LogCollector()
+        node = Mock()
+        node.metadata.labels = {'node.kubernetes.io/instance-type': 'h100-80gb-sxm-ib.8x'}
+        collector.k8s_api.read_node = Mock(return_value=node)
+        collector._detect_bundled_driver_mode = Mock(wraps=collector._detect_bundled_driver_mode)
+
+        self.assertFalse(collector._is_bundled_driver_mode())
+        self.assertFalse(collector._is_bundled_driver_mode())
+        collector._detect_bundled_driver_mode.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Dict
 from utils import LiteralStr
 
@@ -8,24 +9,63 @@ AMD_LABEL_KEY = "app.kubernetes.io/name"
 DEFAULT_AMD_NAMESPACE = "kube-amd-gpu"
 DEFAULT_AMD_SCRAPE_INTERVAL = 60
 
+# Metrics kept by the AMD filter transform.
+AMD_METRICS_ALLOWLIST = (
+    "gpu_used_visible_vram",
+    "gpu_free_visible_vram",
+    "gpu_total_visible_vram",
+    "gpu_gfx_activity",
+    "gpu_power_usage",
+    "gpu_umc_activity",
+    "gpu_prof_tensor_active_percent",
+    "pcie_bandwidth",
+    "gpu_junction_temperature",
+    "gpu_xgmi_link_rx",
+    "gpu_xgmi_link_tx",
+    "pcie_replay_count",
+    "gpu_ecc_uncorrect_total",
+    "gpu_ecc_correct_total",
+    "gpu_afid_errors",
+    "gpu_prof_occupancy_percent",
+    "gpu_prof_sm_active",
+)
+
+# VRL condition for the filter transform. The allowlist is an object so each
+# event is a key lookup rather than a scan of the whole list. Built once at
+# import; set_scrape runs on every reconcile.
+_AMD_FILTER_VRL = LiteralStr(
+    "\nmetrics_allowlist = {\n"
+    + "".join(f'    "{name}": true,\n' for name in AMD_METRICS_ALLOWLIST)
+    + "}\n"
+    + "is_boolean(get(metrics_allowlist, [.name]) ?? null)\n"
+)
 
+
+@dataclass(frozen=True, slots=True)
 class AmdExporterManager:
-    def __init__(self, cfg: Dict):
-        self.enabled = cfg.get("enabled", True)
-        self.port = cfg.get("port", 5000)
-        self.path = cfg.get("path", "/metrics")
-        self.scrape_interval = cfg.get("scrape_interval", DEFAULT_AMD_SCRAPE_INTERVAL)
-        self.app_label = DEFAULT_AMD_APP_LABEL
-        self.namespace = DEFAULT_AMD_NAMESPACE
+    enabled: bool = True
+    port: int = 5000
+    path: str = "/metrics"
+    scrape_interval: int = DEFAULT_AMD_SCRAPE_INTERVAL
+    app_label: str = DEFAULT_AMD_APP_LABEL
+    namespace: str = DEFAULT_AMD_NAMESPACE
+
+    @classmethod
+    def from_dict(cls, cfg: Dict):
+        return cls(
+            enabled=cfg.get("enabled", True),
+            port=cfg.get("port", 5000),
+            path=cfg.get("path", "/metrics"),
+            scrape_interval=cfg.get("scrape_interval", DEFAULT_AMD_SCRAPE_INTERVAL),
+        )
 
     def is_exporter_pod(self, pod) -> bool:
-        labels = pod.metadata.labels or {}
-        if not labels:
+        # Namespace first: almost every pod on the node fails it, and it
+        # skips the label lookup entirely.
+        if pod.metadata.namespace != self.namespace:
             return False
-        return (
-                pod.metadata.namespace == self.namespace
-                and labels.get(AMD_LABEL_KEY) == self.app_label
-        )
+        labels = pod.metadata.labels
+        return bool(labels) and labels.get(AMD_LABEL_KEY) == self.app_label
 
     def build_endpoint(self, pod_ip: str) -> str:
         return f"http://{pod_ip}:{self.port}{self.path}"
@@ -41,48 +81,23 @@ class AmdExporterManager:
         }
         transforms = vector_cfg.setdefault("transforms", {})
         # Add a filter transform that keeps only the specified AMD metrics via VRL condition
-        filter_vrl = LiteralStr(
-            """
-metrics_allowlist = [
-    "gpu_used_visible_vram",
-    "gpu_free_visible_vram",
-    "gpu_total_visible_vram",
-    "gpu_gfx_activity",
-    "gpu_power_usage",
-    "gpu_umc_activity",
-    "gpu_prof_tensor_active_percent",
-    "pcie_bandwidth",
-    "gpu_junction_temperature",
-    "gpu_xgmi_link_rx",
-    "gpu_xgmi_link_tx",
-    "pcie_replay_count",
-    "gpu_ecc_uncorrect_total",
-    "gpu_ecc_correct_total",
-    "gpu_afid_errors",
-    "gpu_prof_occupancy_percent",
-    "gpu_prof_sm_active",
-]
-includes(metrics_allowlist, .name)
-"""
-        )
         transforms[AMD_FILTER_TRANSFORM_NAME] = {
             "type": "filter",
             "inputs": [AMD_EXPORTER_SOURCE_NAME],
             "condition": {
                 "type": "vrl",
-                "source": filter_vrl,
+                "source": _AMD_FILTER_VRL,
             },
         }
         # Wire the filter output into the target node transform
-        inputs = set(transforms[transform_name]["inputs"])
+        inputs = transforms[transform_name]["inputs"]
         if AMD_FILTER_TRANSFORM_NAME not in inputs:
-            transforms[transform_name]["inputs"].append(AMD_FILTER_TRANSFORM_NAME)
+            inputs.append(AMD_FILTER_TRANSFORM_NAME)
 
     def remove_scrape(self, vector_cfg: dict, transform_name: str):
         vector_cfg.get("sources", {}).pop(AMD_EXPORTER_SOURCE_NAME, None)
         transforms = vector_cfg.get("transforms", {})
-        inputs = set(transforms.get(transform_name, {}).get("inputs", []))
-        inputs.discard(AMD_FILTER_TRANSFORM_NAME)
-        if transform_name in transforms:
-            transforms[transform_name]["inputs"] = sorted(inputs)
+        inputs = transforms.get(transform_name, {}).get("inputs", [])
+        if AMD_FILTER_TRANSFORM_NAME in inputs:
+            inputs.remove(AMD_FILTER_TRANSFORM_NAME)
         transforms.pop(AMD_FILTER_TRANSFORM_NAME, None)
\ No newline at end of file
@@ -12,13 +12,14 @@ from vector_config_reloader_app import (
     CUSTOM_METRICS_PATH_ANNOTATION,
     CUSTOM_METRICS_CONFIG_MAP_KEY,
     DCGM_EXPORTER_SOURCE_NAME,
+    AMD_EXPORTER_SOURCE_NAME,
     POD_TYPE_CUSTOM,
     POD_TYPE_DCGM,
     POD_TYPE_KSM,
     POD_TYPE_SLURM,
     POD_TYPE_CME,
 )
-from utils import YamlUtils
+from utils import YamlUtils, LiteralStr
 
 
 class DummyPod:
@@ -49,6 +50,7 @@ def _isolate_env(monkeypatch, tmp_path):
             self._cm_raises = None  # set to an Exception instance to simulate failure
 
         def list_pod_for_all_namespaces(self, **kwargs):
+            self._list_kwargs = kwargs
             return types.SimpleNamespace(items=self._pods)
 
         def read_namespaced_config_map(self, name, namespace):
@@ -143,6 +145,12 @@ def test_classify_pod():
     # Bare pod with no relevant labels/annotations
     assert r.classify_pod(DummyPod("other", "ns", ip="1.1.1.7")) is None
 
+    # The API returns None, not {}, when a pod has no labels/annotations
+    bare = DummyPod("bare", "kube-amd-gpu", ip="1.1.1.8")
+    bare.metadata.labels = None
+    bare.metadata.annotations = None
+    assert r.classify_pod(bare) is None
+
 
 def test_get_custom_metrics_endpoint_cfg_defaults():
     r = _new_reloader_with_pods([])
@@ -251,6 +259,29 @@ def test_runtime_config_build_endpoints():
     assert rc.build_endpoints("10.0.0.1") == ["http://10.0.0.1:8080/a", "http://10.0.0.1:8080/b"]
 
 
+def test_amd_exporter_manager_from_dict_defaults_and_endpoint():
+    from amd_exporter import AmdExporterManager
+    mgr = AmdExporterManager.from_dict({"port": 5001, "scrape_interval": 30})
+    assert mgr.enabled is True
+    assert mgr.scrape_interval == 30
+    assert mgr.namespace == "kube-amd-gpu"
+    assert mgr.build_endpoint("10.0.0.2") == "http://10.0.0.2:5001/metrics"
+
+
+def test_amd_set_scrape_filters_on_allowlist_object():
+    from amd_exporter import AmdExporterManager, AMD_METRICS_ALLOWLIST, AMD_FILTER_TRANSFORM_NAME
+    mgr = AmdExporterManager()
+    vector_cfg = {"transforms": {"enrich": {"inputs": ["a"]}}}
+    mgr.set_scrape(vector_cfg, "http://10.0.0.2:5000/metrics", "enrich", 0.5)
+
+    assert vector_cfg["sources"][AMD_EXPORTER_SOURCE_NAME]["scrape_timeout_secs"] == 30
+    assert vector_cfg["transforms"]["enrich"]["inputs"] == ["a", AMD_FILTER_TRANSFORM_NAME]
+    vrl = vector_cfg["transforms"][AMD_FILTER_TRANSFORM_NAME]["condition"]["source"]
+    for name in AMD_METRICS_ALLOWLIST:
+        assert f'"{name}": true' in vrl
+    assert "get(metrics_allowlist, [.name])" in vrl
+
+
 # -------- Init failure --------
 
 def test_init_exits_when_read_node_fails(monkeypatch):
@@ -347,6 +378,15 @@ def test_fetch_configmap_returns_none_on_other_error():
 
 # -------- Pod listing filters --------
 
+def test_list_active_relevant_pods_reads_from_apiserver_cache():
+    r = _new_reloader_with_pods([])
+    r._list_active_relevant_pods()
+    assert r.k8s_api_client._list_kwargs == {
+        "field_selector": "spec.nodeName=test-node,status.phase=Running",
+        "resource_version": "0",
+    }
+
+
 def test_list_active_relevant_pods_skips_terminating_irrelevant_and_no_ip():
     pods = [
         DummyPod("dcgm-running", "ns", ip="10.0.0.1", labels={"app": "nvidia-dcgm-exporter"}),
@@ -391,6 +431,21 @@ def test_reconcile_no_changes_does_not_rewrite_config():
     assert mtime_before == mtime_after
 
 
+def test_reconcile_pod_replaced_with_same_config_does_not_rewrite():
+    r = _new_reloader_with_pods([DummyPod("dcgm-1", "ns", ip="10.0.0.1", labels={"app": "nvidia-dcgm-exporter"})])
+    r.reconcile_once()
+    inode_before = os.stat(vcr_mod.VECTOR_CONFIG_PATH).st_ino
+
+    # New pod name, same IP: the fingerprint changes but the rendered config does not
+    replacement = DummyPod("dcgm-2", "ns", ip="10.0.0.1", labels={"app": "nvidia-dcgm-exporter"})
+    r.k8s_api_client._pods = [replacement]
+    r.reconcile_once()
+
+    assert os.stat(vcr_mod.VECTOR_CONFIG_PATH).st_ino == inode_before
+    # Tracked state still advances so the next cycle sees no change
+    assert r._tracked_pod_fingerprint == r._compute_pod_fingerprint([(replacement, POD_TYPE_DCGM)])
+
+
 def test_reconcile_pod_added_triggers_reload():
     r = _new_reloader_with_pods([])
     r.reconcile_once()
@@ -570,3 +625,45 @@ def test_logs_envelope_contract():
 
     internal = vector_cfg["transforms"]["parse_internal_logs"]["source"]
     assert '.log_source = "crusoe-watch-agent"' in internal
+
+
+def test_save_yaml_writes_literal_str_as_block_scalar(tmp_path):
+    path = tmp_path / "vector.yaml"
+    YamlUtils.save_yaml(str(path), {"transforms": {"t": {"source": LiteralStr(".a = 1\n.b = 2\n")}}})
+
+    assert "source: |\n" in path.read_text()
+    assert YamlUtils.load_yaml_config(str(path)) == {"transforms": {"t": {"source": ".a = 1\n.b = 2\n"}}}
+
+
+def test_load_yaml_config_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "base.yaml"
+    path.write_text(yaml.safe_dump({"sources": {"a": {"type": "x"}}}))
+    parses = []
+    real_load = yaml.load
+    monkeypatch.setattr(yaml, "load", lambda *a, **kw: parses.append(1) or real_load(*a, **kw))
+
+    first = YamlUtils.load_yaml_config(str(path))
+    first["sources"]["b"] = {}
+    second = YamlUtils.load_yaml_config(str(path))
+    assert second == {"sources": {"a": {"type": "x"}}}
+    assert len(parses) == 1
+
+    path.write_text(yaml.safe_dump({"sources": {"c": {"type": "y"}, "d": {}}}))
+    assert YamlUtils.load_yaml_config(str(path)) == {"sources": {"c": {"type": "y"}, "d": {}}}
+    assert len(parses) == 2
+
+
+def test_save_yaml_leaves_no_temp_file_when_replace_fails(tmp_path, monkeypatch):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    path = out_dir / "vector.yaml"
+    path.write_text("old: true\n")
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    with pytest.raises(OSError):
+        YamlUtils.save_yaml(str(path), {"new": True})
+    assert os.listdir(out_dir) == ["vector.yaml"]
+    assert path.read_text() == "old: true\n"
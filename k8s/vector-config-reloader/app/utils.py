@@ -1,3 +1,5 @@
+import copy
+import functools
 import os
 import tempfile
 import yaml
@@ -6,6 +8,13 @@ import logging
 from datetime import datetime, timezone
 from prometheus_client import Counter, start_http_server
 
+# Prefer the libyaml-backed loader/dumper; fall back to the pure-Python ones
+# when PyYAML was built without the C extension.
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 class LiteralStr(str): pass
 
 
@@ -26,30 +35,64 @@ class JSONFormatter(logging.Formatter):
 
 
 def literal_str_representer(dumper, data):
-    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    # The libyaml emitter only accepts exact str values, not subclasses
+    return dumper.represent_scalar("tag:yaml.org,2002:str", str(data), style="|")
 
-# Register representer for both default Dumper and SafeDumper used by yaml.safe_dump
+# Register representer for the default Dumper, SafeDumper used by yaml.safe_dump,
+# and the dumper YamlUtils writes with
 yaml.Dumper.add_representer(LiteralStr, literal_str_representer)
 yaml.SafeDumper.add_representer(LiteralStr, literal_str_representer)
+_Dumper.add_representer(LiteralStr, literal_str_representer)
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml_file(path: str, mtime_ns: int, size: int, inode: int) -> dict:
+    # The stat fields are only part of the cache key, so a rewritten or
+    # replaced file is parsed again.
+    with open(path) as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
 
 class YamlUtils:
     @staticmethod
     def load_yaml_config(path: str) -> dict:
-        with open(path) as f:
-            cfg = dict(yaml.safe_load(f))
-        return cfg
+        st = os.stat(path)
+        # Callers mutate the result, so hand out a copy of the cached parse
+        return copy.deepcopy(_load_yaml_file(path, st.st_mtime_ns, st.st_size, st.st_ino))
 
     @staticmethod
     def load_yaml_string(yaml_string: str) -> dict:
-        return dict(yaml.safe_load(yaml_string) or {})
+        return yaml.load(yaml_string, Loader=_Loader) or {}
+
+    @staticmethod
+    def dump_yaml(cfg: dict) -> str:
+        return yaml.dump(cfg, Dumper=_Dumper)
 
     @staticmethod
     def save_yaml(path: str, cfg: dict):
+        YamlUtils.write_text(path, YamlUtils.dump_yaml(cfg))
+
+    @staticmethod
+    def write_text(path: str, data: str):
+        # Write the whole document in one go to a temp file, then swap it in
+        # atomically so Vector never sees a partial config.
+        # The data is fsynced before the rename so a crash cannot leave an
+        # empty file in place of the old config.
         dir_name = os.path.dirname(path) or "."
         with tempfile.NamedTemporaryFile(mode="w", dir=dir_name, delete=False) as f:
-            yaml.safe_dump(cfg, f)
             temp_path = f.name
-        os.rename(temp_path, path)
+            try:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.close()
+                os.unlink(temp_path)
+                raise
+        try:
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
 
 
 # Prometheus metrics for VCR (common labels added by Vector transform)
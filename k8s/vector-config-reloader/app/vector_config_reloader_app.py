@@ -44,6 +44,9 @@ SCRAPE_INTERVAL_MIN_THRESHOLD = 5
 SCRAPE_TIMEOUT_PERCENTAGE = 0.7
 RECONCILE_INTERVAL_SECS = 60
 
+# Characters not allowed in Vector component names
+INVALID_COMPONENT_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+
 # Pod classification labels (used in pod fingerprints and logging)
 POD_TYPE_CUSTOM = "custom_metrics"
 POD_TYPE_DCGM = "dcgm_exporter"
@@ -138,6 +141,7 @@ class VectorConfigReloader:
         self._tracked_pod_fingerprint = None  # frozenset; None means "first cycle, force reload"
         self._tracked_cm_checksum = None
         self._tracked_cm_data = {}
+        self._written_config_digest = None  # sha256 of the last Vector config written
 
         reloader_cfg = YamlUtils.load_yaml_config(RELOADER_CONFIG_PATH)
         self.dcgm_cfg = ExporterRuntimeConfig.from_dict(
@@ -157,7 +161,7 @@ class VectorConfigReloader:
             reloader_cfg.get("crusoe_metrics_exporter", {}),
             default_port=9500,
         )
-        self.amd_manager = AmdExporterManager(reloader_cfg.get("amd_metrics", {}))
+        self.amd_manager = AmdExporterManager.from_dict(reloader_cfg.get("amd_metrics", {}))
         self.custom_metrics_enabled = reloader_cfg["custom_metrics"].get("enabled", True)
         self.logs_enabled = reloader_cfg.get("logs", {}).get("enabled", True)
         self.default_custom_metrics_config = reloader_cfg["custom_metrics"]
@@ -500,7 +504,7 @@ if exists(.metadata.level) {
     @staticmethod
     def sanitize_name(name: str) -> str:
         # replace invalid chars with underscores
-        return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+        return INVALID_COMPONENT_NAME_CHARS.sub('_', name)
 
     @staticmethod
     def is_pod_active(pod):
@@ -518,11 +522,14 @@ if exists(.metadata.level) {
         and are looked up via APP_KUBERNETES_NAME_TO_TYPE; AMD additionally
         requires a namespace match (handled inside amd_manager).
         """
-        annotations = pod.metadata.annotations or {}
-        if annotations.get(CUSTOM_METRICS_SCRAPE_ANNOTATION) == "true":
+        annotations = pod.metadata.annotations
+        if annotations and annotations.get(CUSTOM_METRICS_SCRAPE_ANNOTATION) == "true":
             return POD_TYPE_CUSTOM
 
-        labels = pod.metadata.labels or {}
+        # Every remaining type is identified by labels (AMD included)
+        labels = pod.metadata.labels
+        if not labels:
+            return None
         if labels.get("app") == "nvidia-dcgm-exporter":
             return POD_TYPE_DCGM
 
@@ -653,9 +660,9 @@ if exists(.metadata.level) {
             "scrape_interval_secs": self.dcgm_cfg.scrape_interval,
             "scrape_timeout_secs": int(self.dcgm_cfg.scrape_interval * SCRAPE_TIMEOUT_PERCENTAGE)
         }
-        inputs = set(vector_cfg["transforms"][NODE_METRICS_VECTOR_TRANSFORM_NAME]["inputs"])
+        inputs = vector_cfg["transforms"][NODE_METRICS_VECTOR_TRANSFORM_NAME]["inputs"]
         if DCGM_EXPORTER_SOURCE_NAME not in inputs:
-            vector_cfg["transforms"][NODE_METRICS_VECTOR_TRANSFORM_NAME]["inputs"].append(DCGM_EXPORTER_SOURCE_NAME)
+            inputs.append(DCGM_EXPORTER_SOURCE_NAME)
 
     def _apply_cluster_exporter(self, vector_cfg: dict, spec: ClusterExporterSpec, pod_ip: str):
         """Wire a cluster-scoped exporter (KSM/Slurm/CME) into the Vector config."""
@@ -853,8 +860,12 @@ if exists(.metadata.level) {
         Raises on API failure so the caller can decide retry behavior.
         """
         try:
+            # resource_version="0" lets the apiserver answer from its watch
+            # cache instead of a quorum read from etcd on every cycle. The
+            # cache may lag by a moment, which the next cycle absorbs.
             pods = self.k8s_api_client.list_pod_for_all_namespaces(
-                field_selector=f"spec.nodeName={self.node_name},status.phase=Running"
+                field_selector=f"spec.nodeName={self.node_name},status.phase=Running",
+                resource_version="0",
             ).items
         except Exception as e:
             errors_total.labels(error_type="k8s_api_list_pods").inc()
@@ -1001,11 +1012,21 @@ if exists(.metadata.level) {
 
         base_cfg["sinks"]["cms_gateway_node_metrics"]["buffer"] = self.sink_buffer_config
 
-        # Always reassign so LiteralStr is preserved through any deepcopy semantics
+        # The base config carries a generic, hostname-parsing source; replace it
+        # with this node's VRL (tags resolved once at startup) on every rebuild.
         base_cfg["transforms"][NODE_METRICS_VECTOR_TRANSFORM_NAME]["source"] = self.node_metrics_vector_transform_source
 
+        # Pod churn that renders to the same config (e.g. a pod restarted with
+        # the same IP) must not touch the file, or Vector reloads for nothing.
+        rendered = YamlUtils.dump_yaml(base_cfg)
+        digest = hashlib.sha256(rendered.encode("utf-8")).hexdigest()
+        if digest == self._written_config_digest and Path(VECTOR_CONFIG_PATH).exists():
+            LOG.info("Vector config unchanged after rebuild; skipping write.")
+            return
+
         with self._config_lock:
-            YamlUtils.save_yaml(VECTOR_CONFIG_PATH, base_cfg)
+            YamlUtils.write_text(VECTOR_CONFIG_PATH, rendered)
+        self._written_config_digest = digest
 
         counts_by_type = {}
         for _, pod_type in classified_pods: